@@ -104,18 +104,36 @@ _DANGEROUS_PATTERNS = (
     "rm -rf", "rm -r /", "mkfs", "dd if=", ":(){ ", "> /dev/sd",
     "chmod -r 777 /", "format c:",
 )
+_DANGEROUS_RE = re.compile(
+    "|".join(map(re.escape, _DANGEROUS_PATTERNS)), re.IGNORECASE,
+)
+# A single quote only opens a span when it is not preceded by a word
+# character, so apostrophes in prose ("don't", "system's") are ignored.
+_QUOTED_RE = re.compile(r"""(?<!\w)'([^']{2,})'|"([^"]{2,})"|`([^`]{2,})`""")
+_ABS_PATH_RE = re.compile(r'(/[\w./\-]+)')
 
 
 def _is_safe_command(cmd: str) -> bool:
-    cmd_lower = cmd.strip().lower()
-    return not any(p in cmd_lower for p in _DANGEROUS_PATTERNS)
+    return _DANGEROUS_RE.search(cmd) is None
 
 
 def _extract_quoted_strings(text: str) -> list[str]:
-    results: list[str] = []
-    for pat in (r"'([^']{2,})'", r'"([^"]{2,})"', r'`([^`]{2,})`'):
-        results.extend(re.findall(pat, text))
-    return results
+    """Return quoted spans of 2+ chars in the order they appear.
+
+    One pass over *text*; a quote nested inside another kind of quote is
+    part of the outer span, not a separate result.
+    """
+    return [next(filter(None, m.groups())) for m in _QUOTED_RE.finditer(text)]
+
+
+# Longest first, so "the identified OS version" is not half-replaced as
+# "the identified OS".
+_OS_PLACEHOLDER_RES = tuple(
+    re.compile(re.escape(p), re.IGNORECASE) for p in (
+        "the identified OS version", "the identified OS",
+        "the OS version", "the current OS",
+    )
+)
 
 
 def _build_search_query(desc: str, facts: list[str]) -> str:
@@ -135,14 +153,8 @@ def _build_search_query(desc: str, facts: list[str]) -> str:
             break
 
     if os_fact:
-        for placeholder in (
-            "the identified OS version", "the identified OS",
-            "the OS version", "the current OS",
-        ):
-            if placeholder.lower() in query.lower():
-                query = re.sub(
-                    re.escape(placeholder), os_fact, query, flags=re.IGNORECASE,
-                )
+        for pattern in _OS_PLACEHOLDER_RES:
+            query = pattern.sub(lambda _: os_fact, query)
 
     return query.strip().rstrip(".")
 
@@ -208,13 +220,13 @@ def _auto_execute_step(step: dict, session: SessionMemory) -> ToolResult | None:
         return execute_tool_with_retry("docs_search", {"query": query})
 
     if tool == "read_file":
-        paths = re.findall(r'(/[\w./\-]+)', desc)
+        paths = _ABS_PATH_RE.findall(desc)
         if paths:
             return execute_tool_with_retry("read_file", {"path": paths[0]})
         return None
 
     if tool == "list_dir":
-        paths = re.findall(r'(/[\w./\-]+)', desc)
+        paths = _ABS_PATH_RE.findall(desc)
         return execute_tool_with_retry("list_dir", {"path": paths[0] if paths else "."})
 
     if tool == "python_eval":
@@ -230,20 +242,39 @@ def _auto_execute_step(step: dict, session: SessionMemory) -> ToolResult | None:
 # Fact extraction from tool output
 # ---------------------------------------------------------------------------
 
+_KERNEL_RE = re.compile(r'Linux \S+ (\d+\.\d+\.\S+)')
+_OS_RELEASE_RE = re.compile(
+    r'^[^\S\n]*(PRETTY_NAME|VERSION_ID|ID|HOME_URL)=(.*)$', re.MULTILINE,
+)
+_OS_RELEASE_LABELS = {
+    "PRETTY_NAME": "OS",
+    "VERSION_ID": "OS Version ID",
+    "ID": "OS ID",
+    "HOME_URL": "OS Home URL",
+}
+
+
 def _extract_facts_from_output(tool_name: str, output: str) -> list[str]:
     facts: list[str] = []
 
     if tool_name in ("list_dir", "list_dir>shell"):
-        entries = [e.strip() for e in output.split() if e.strip()]
+        entries = output.split()
         if entries:
-            visible = [e for e in entries if not e.startswith(".")]
-            dirs = [e for e in visible if not "." in e or e.endswith("/")]
-            files = [e for e in visible if "." in e and not e.endswith("/")]
+            visible: list[str] = []
+            files: list[str] = []
+            py_files: list[str] = []
+            for e in entries:
+                if e.endswith(".py"):
+                    py_files.append(e)
+                if e.startswith("."):
+                    continue
+                visible.append(e)
+                if "." in e and not e.endswith("/"):
+                    files.append(e)
             listing = ", ".join(visible[:30])
             facts.append(f"Directory contents: {listing}")
             if files:
                 facts.append(f"Files found: {', '.join(files[:20])}")
-            py_files = [e for e in entries if e.endswith(".py")]
             if py_files:
                 facts.append(f"Python files: {', '.join(py_files[:20])}")
         return facts
@@ -251,18 +282,12 @@ def _extract_facts_from_output(tool_name: str, output: str) -> list[str]:
     if tool_name != "shell":
         return facts
 
-    for line in output.splitlines():
-        line = line.strip()
-        if line.startswith("PRETTY_NAME="):
-            facts.append(f"OS: {line.split('=', 1)[1].strip('\"')}")
-        elif line.startswith("VERSION_ID="):
-            facts.append(f"OS Version ID: {line.split('=', 1)[1].strip('\"')}")
-        elif line.startswith("ID=") and not line.startswith("ID_LIKE"):
-            facts.append(f"OS ID: {line.split('=', 1)[1].strip('\"')}")
-        elif line.startswith("HOME_URL="):
-            facts.append(f"OS Home URL: {line.split('=', 1)[1].strip('\"')}")
-
-    kern_match = re.search(r'Linux \S+ (\d+\.\d+\.\S+)', output)
+    facts.extend(dict.fromkeys(
+        _OS_RELEASE_LABELS[m.group(1)] + ": " + m.group(2).rstrip().strip('"')
+        for m in _OS_RELEASE_RE.finditer(output)
+    ))
+
+    kern_match = _KERNEL_RE.search(output)
     if kern_match:
         facts.append(f"Kernel: {kern_match.group(1)}")
 
@@ -315,12 +340,15 @@ def _build_system_prompt(
 # Response parsing
 # ---------------------------------------------------------------------------
 
+_TOOL_CALL_RE = re.compile(r"<tool_call>\s*(.*?)\s*</tool_call>", re.DOTALL)
+_FINAL_ANSWER_RE = re.compile(r"<final_answer>\s*(.*?)\s*</final_answer>", re.DOTALL)
+_STORE_FACT_RE = re.compile(r"<store_fact>\s*(.*?)\s*</store_fact>", re.DOTALL)
+
+
 def _parse_response(text: str) -> dict:
     result: dict = {"type": "reasoning", "content": text}
 
-    tool_match = re.search(
-        r"<tool_call>\s*(.*?)\s*</tool_call>", text, re.DOTALL,
-    )
+    tool_match = _TOOL_CALL_RE.search(text)
     if tool_match:
         try:
             call = json.loads(tool_match.group(1))
@@ -333,13 +361,11 @@ def _parse_response(text: str) -> dict:
         except json.JSONDecodeError:
             result = {"type": "malformed_tool_call", "content": tool_match.group(1)}
 
-    answer_match = re.search(
-        r"<final_answer>\s*(.*?)\s*</final_answer>", text, re.DOTALL,
-    )
+    answer_match = _FINAL_ANSWER_RE.search(text)
     if answer_match:
         result = {"type": "final_answer", "content": answer_match.group(1)}
 
-    facts = re.findall(r"<store_fact>\s*(.*?)\s*</store_fact>", text, re.DOTALL)
+    facts = _STORE_FACT_RE.findall(text)
     if facts:
         result["facts"] = facts
 
@@ -406,7 +432,7 @@ def _execute_step(
     )
 
     messages: list[dict] = [{"role": "system", "content": system_prompt}]
-    for entry in session.history[-10:]:
+    for entry in session.recent_history(10):
         role = entry.role if entry.role in ("user", "assistant") else "assistant"
         messages.append({"role": role, "content": entry.content})
     messages.append({"role": "user", "content": step_prompt})
@@ -432,9 +458,9 @@ def _execute_step(
 
         # Store facts
         for fact in parsed.get("facts", []):
-            session.add_fact(fact)
-            persistent.store_fact(fact)
-            print(f"[agent]   Stored fact: {fact[:60]}", file=sys.stderr)
+            if session.add_fact(fact):
+                persistent.store_fact(fact)
+                print(f"[agent]   Stored fact: {fact[:60]}", file=sys.stderr)
 
         if parsed["type"] == "tool_call":
             _handle_tool_call(parsed, step, session, persistent)
@@ -703,7 +729,7 @@ def run_agent(
 
     print(f"[agent] Plan ({len(plan)} steps):", file=sys.stderr)
     for step in plan:
-        deps = step.get("depends_on", [])
+        deps = step.get("depends_on")
         dep_str = f" (after {deps})" if deps else ""
         print(
             f"  {step['id']}. {step['description']} "
@@ -874,8 +900,7 @@ def _record_tool_result(
     if result.success:
         auto_facts = _extract_facts_from_output(tool_name, result.output)
         for fact in auto_facts:
-            if fact not in session.facts:
-                session.add_fact(fact)
+            if session.add_fact(fact):
                 persistent.store_fact(fact)
                 print(f"[agent]   Extracted fact: {fact}", file=sys.stderr)
 
@@ -971,7 +996,7 @@ def _print_revised_plan(session: SessionMemory):
     for step in session.plan:
         if step["status"] == "completed":
             continue
-        deps = step.get("depends_on", [])
+        deps = step.get("depends_on")
         dep_str = f" (after {deps})" if deps else ""
         print(
             f"  {step['id']}. {step['description'][:70]} "
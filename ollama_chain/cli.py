@@ -6,23 +6,38 @@ import gc
 import sys
 
 from .models import discover_models, ensure_memory_available, model_names, pick_models, list_models_table
-from .chains import CHAINS, chain_pcap, chain_k8s
 from .common import ensure_sources, unload_all_models
 from .memory import PersistentMemory
 from .metrics import evaluate_prompt, evaluate_mode_alignment, evaluate_response
 from .optimizer import optimize_prompt, format_optimization_report
 
 
+# Mirrors ``chains.CHAINS`` plus the CLI-only modes.  Spelled out so that
+# building the parser does not import ``chains`` (and scapy through it);
+# tests/test_cli.py keeps the two in sync.
+_MODE_CHOICES = (
+    "cascade", "auto", "route", "pipeline", "verify", "consensus",
+    "search", "fast", "strong", "agent", "pcap", "k8s",
+)
+
+_PCAP_EXTENSIONS = (".pcap", ".pcapng", ".cap")
+
+
 def detect_pcap_path(text: str) -> str | None:
     """If the query contains a path ending in .pcap/.pcapng/.cap, extract it."""
+    # Every match contains ".cap" or ".pcap"; most queries have neither,
+    # so check that before splitting.
+    lowered = text.lower()
+    if ".cap" not in lowered and ".pcap" not in lowered:
+        return None
     for token in text.split():
         cleaned = token.strip("\"'(),;")
-        if cleaned.lower().endswith((".pcap", ".pcapng", ".cap")):
+        if cleaned.lower().endswith(_PCAP_EXTENSIONS):
             return cleaned
     return None
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="ollama-chain",
         description=(
@@ -106,7 +121,7 @@ examples:
     parser.add_argument("query", nargs="*", help="Query to process")
     parser.add_argument(
         "--mode", "-m",
-        choices=list(CHAINS.keys()) + ["pcap", "k8s"],
+        choices=_MODE_CHOICES,
         default="cascade",
         help="Chaining mode (default: cascade)",
     )
@@ -172,7 +187,11 @@ examples:
         action="store_true",
         help="Optimize and display the improved prompt, then exit (no execution)",
     )
+    return parser
 
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     # --- Memory management commands (no models needed) ---
@@ -199,6 +218,8 @@ examples:
                     print(f"    {s['summary']}")
         sys.exit(0)
 
+    from .chains import CHAINS, chain_k8s, chain_pcap
+
     models = discover_models()
     all_names = model_names(models)
 
@@ -1,7 +1,12 @@
 """Shared utilities used by both chains and the agent."""
 
+import functools
+import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 
 import ollama as ollama_client
 
@@ -20,12 +25,24 @@ _SOURCE_MARKERS = (
     "## sources", "## references", "**sources**", "**references**",
     "### sources", "### references",
 )
+_SOURCE_MARKER_RE = re.compile(
+    "|".join(map(re.escape, _SOURCE_MARKERS)), re.IGNORECASE,
+)
+
+# Balanced reasoning blocks emitted by thinking models; an unclosed
+# ``<think>`` never matches and is left in the answer.
+_THINK_RE = re.compile(r"<think>.*?</think>\s*", re.DOTALL)
 
-_RETRYABLE_FRAGMENTS = ("EOF", "eof", "connection", "timeout", "reset", "broken pipe")
+_RETRYABLE_EXCEPTIONS = (ConnectionError, TimeoutError)
+# Client errors (httpx, ollama.ResponseError) do not subclass the builtins
+# above, so transient failures are also recognised by their message.
+_RETRYABLE_FRAGMENTS = ("eof", "connection", "timeout", "reset", "broken pipe")
+_RETRYABLE_RE = re.compile("|".join(_RETRYABLE_FRAGMENTS), re.IGNORECASE)
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 2  # seconds; doubles each attempt
 
 _DEFAULT_KEEP_ALIVE = "15m"
+_MAX_UNLOAD_WORKERS = 8
 
 
 # ---------------------------------------------------------------------------
@@ -34,6 +51,10 @@ _DEFAULT_KEEP_ALIVE = "15m"
 
 _thinking_cache: dict[str, bool] = {}
 
+# Name fragments of model families known to think, used when the API is
+# unreachable.  Matched anywhere in the name so registry paths still hit.
+_THINKING_NAME_HINTS = ("qwen3", "deepseek-r1", "qwq")
+
 
 def model_supports_thinking(model: str) -> bool:
     """Check whether *model* supports thinking / chain-of-thought mode.
@@ -41,8 +62,9 @@ def model_supports_thinking(model: str) -> bool:
     Queries `ollama.show()` for the ``capabilities`` list and caches the
     result.  Falls back to name-based heuristics if the API call fails.
     """
-    if model in _thinking_cache:
-        return _thinking_cache[model]
+    cached = _thinking_cache.get(model)
+    if cached is not None:
+        return cached
 
     supports = False
     try:
@@ -51,7 +73,7 @@ def model_supports_thinking(model: str) -> bool:
         supports = "thinking" in caps
     except Exception:
         name = model.lower().split(":")[0]
-        supports = any(f in name for f in ("qwen3", "deepseek-r1", "qwq"))
+        supports = any(f in name for f in _THINKING_NAME_HINTS)
 
     _thinking_cache[model] = supports
     return supports
@@ -83,8 +105,10 @@ def chat_with_retry(
             return ollama_client.chat(**kwargs)
         except Exception as e:
             last_err = e
-            err_text = str(e).lower()
-            retryable = any(frag in err_text for frag in _RETRYABLE_FRAGMENTS)
+            retryable = (
+                isinstance(e, _RETRYABLE_EXCEPTIONS)
+                or _RETRYABLE_RE.search(str(e)) is not None
+            )
             if not retryable or attempt == retries:
                 raise
             delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
@@ -106,12 +130,14 @@ def sanitize_messages(messages: list[dict]) -> list[dict]:
     """
     if not messages:
         return messages
-    merged: list[dict] = [messages[0].copy()]
-    for msg in messages[1:]:
-        if msg["role"] == merged[-1]["role"]:
-            merged[-1]["content"] += "\n\n" + msg["content"]
-        else:
-            merged.append(msg.copy())
+    merged: list[dict] = []
+    for _, run in groupby(messages, key=itemgetter("role")):
+        first = next(run)
+        msg = first.copy()
+        rest = [m["content"] for m in run]
+        if rest:
+            msg["content"] = "\n\n".join([first["content"], *rest])
+        merged.append(msg)
     return merged
 
 
@@ -125,11 +151,15 @@ def unload_model(model: str):
 
 def unload_all_models(models: list[str]):
     """Unload all specified models from Ollama to free system memory."""
-    seen: set[str] = set()
-    for model in models:
-        if model not in seen:
-            seen.add(model)
+    unique = list(dict.fromkeys(models))
+    if len(unique) <= 1:
+        for model in unique:
             unload_model(model)
+        return
+    # Each unload is one blocking request to the Ollama server.
+    workers = min(len(unique), _MAX_UNLOAD_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(unload_model, unique))
 
 
 def ask(
@@ -150,9 +180,11 @@ def ask(
     Lower values (0.3-0.4) improve factual accuracy; higher values
     (0.7-0.9) encourage creativity.
     """
-    can_think = model_supports_thinking(model)
-    if can_think and not thinking:
-        prompt = "/no_think\n" + prompt
+    messages = [{"role": "user", "content": prompt}]
+    if not thinking and model_supports_thinking(model):
+        # A separate system turn avoids copying large prompts and keeps
+        # the directive identical across calls.
+        messages.insert(0, {"role": "system", "content": "/no_think"})
 
     options: dict | None = None
     if temperature is not None:
@@ -160,14 +192,13 @@ def ask(
 
     response = chat_with_retry(
         model=model,
-        messages=[{"role": "user", "content": prompt}],
+        messages=messages,
         options=options,
     )
     content = response["message"]["content"]
-    if "<think>" in content:
-        end = content.find("</think>")
-        if end != -1:
-            content = content[end + len("</think>"):].strip()
+    content, removed = _THINK_RE.subn("", content)
+    if removed:
+        content = content.strip()
     return content
 
 
@@ -175,9 +206,16 @@ def ask(
 # Prompt formatting helpers (Gap 6)
 # ---------------------------------------------------------------------------
 
+@functools.cache
+def _section_header(title: str) -> str:
+    # Keyed on the title only: titles are a small fixed set of literals,
+    # while bodies carry tool output and would grow the cache unbounded.
+    return f"=== {title.upper()} ===\n"
+
+
 def format_prompt_section(title: str, body: str) -> str:
     """Format a named section for inclusion in an LLM prompt."""
-    return f"=== {title.upper()} ===\n{body}"
+    return _section_header(title) + body
 
 
 def build_structured_prompt(
@@ -189,10 +227,11 @@ def build_structured_prompt(
     Produces a cleanly-formatted prompt with clear section boundaries
     that helps the LLM parse distinct information blocks.
     """
-    parts: list[str] = []
-    for title, body in sections:
-        if body and body.strip():
-            parts.append(format_prompt_section(title, body))
+    parts = [
+        format_prompt_section(title, body)
+        for title, body in sections
+        if body and body.strip()
+    ]
     if instructions:
         parts.append(f"\n{instructions}")
     return "\n\n".join(parts)
@@ -204,7 +243,7 @@ def ensure_sources(answer: str, query: str, model: str) -> str:
     Runs a lightweight LLM follow-up only when no sources section is
     detected, keeping the extra call to a minimum.
     """
-    if any(m in answer.lower() for m in _SOURCE_MARKERS):
+    if _SOURCE_MARKER_RE.search(answer):
         return answer
     try:
         sources = ask(
@@ -8,11 +8,17 @@ Provides two layers:
 
 import json
 import time
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 
 MEMORY_DIR = Path.home() / ".ollama_chain"
 
+# Session history is a ring buffer: appends past the cap drop the oldest
+# entry in O(1).  Prompts only ever look at the last few dozen entries.
+_MAX_HISTORY_ENTRIES = 500
+
 
 # ---------------------------------------------------------------------------
 # Content types for multi-modal support
@@ -27,7 +33,7 @@ CONTENT_BINARY_REF = "binary_ref"
 CONTENT_ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     role: str  # "user" | "assistant" | "tool" | "system"
     content: str
@@ -44,9 +50,29 @@ class SessionMemory:
     session_id: str
     goal: str = ""
     plan: list[dict] = field(default_factory=list)
-    history: list[MemoryEntry] = field(default_factory=list)
-    facts: list[str] = field(default_factory=list)
+    history: deque[MemoryEntry] = field(
+        default_factory=lambda: deque(maxlen=_MAX_HISTORY_ENTRIES),
+    )
     tool_results: list[dict] = field(default_factory=list)
+    _facts: list[str] = field(default_factory=list, init=False)
+    # Dedup index for _facts, maintained by add_fact / the facts setter.
+    _fact_set: set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False,
+    )
+
+    @property
+    def facts(self) -> list[str]:
+        """Facts in discovery order.
+
+        Add with :meth:`add_fact`; to replace them all, assign a new list
+        so the dedup index is rebuilt.  Do not mutate the list in place.
+        """
+        return self._facts
+
+    @facts.setter
+    def facts(self, facts: list[str]) -> None:
+        self._facts = list(dict.fromkeys(facts))
+        self._fact_set = set(self._facts)
 
     # -- Core add methods --
 
@@ -66,15 +92,19 @@ class SessionMemory:
             tags=["tool_result", tool_name],
         ))
 
-    def add_fact(self, fact: str):
-        if fact not in self.facts:
-            self.facts.append(fact)
-            self.history.append(MemoryEntry(
-                role="assistant",
-                content=fact,
-                content_type=CONTENT_FACT,
-                tags=["fact"],
-            ))
+    def add_fact(self, fact: str) -> bool:
+        """Record *fact* unless already known; return whether it was added."""
+        if fact in self._fact_set:
+            return False
+        self._fact_set.add(fact)
+        self._facts.append(fact)
+        self.history.append(MemoryEntry(
+            role="assistant",
+            content=fact,
+            content_type=CONTENT_FACT,
+            tags=["fact"],
+        ))
+        return True
 
     def add_error(self, error: str, step_id: int | None = None):
         self.history.append(MemoryEntry(
@@ -87,6 +117,11 @@ class SessionMemory:
 
     # -- Context retrieval (Gap 2 & 6: proper LLM-ready context) --
 
+    def recent_history(self, n: int) -> list[MemoryEntry]:
+        """Return the last *n* history entries, oldest first."""
+        history = self.history
+        return list(islice(history, max(len(history) - n, 0), None))
+
     def get_context_window(self, max_entries: int = 20) -> list[dict]:
         """Return recent history formatted for LLM chat consumption.
 
@@ -96,8 +131,7 @@ class SessionMemory:
         preamble = self.summarize()
         result: list[dict] = [{"role": "assistant", "content": preamble}]
 
-        recent = self.history[-max_entries:]
-        for e in recent:
+        for e in self.recent_history(max_entries):
             role = e.role if e.role in ("user", "assistant") else "assistant"
             result.append({"role": role, "content": e.content})
         return result
@@ -174,7 +208,7 @@ class SessionMemory:
     ) -> list[MemoryEntry]:
         """Return history entries scored by keyword relevance."""
         if not keywords:
-            return list(self.history[-max_entries:])
+            return self.recent_history(max_entries)
 
         scored: list[tuple[MemoryEntry, float]] = []
         kw_lower = [k.lower() for k in keywords]
@@ -205,7 +239,7 @@ class SessionMemory:
                     "in_progress": "[running]",
                     "failed": "[FAILED]",
                 }.get(status, "[ ]")
-                deps = step.get("depends_on", [])
+                deps = step.get("depends_on")
                 dep_str = f" (after step {','.join(map(str, deps))})" if deps else ""
                 lines.append(
                     f"  {marker} {step['id']}. {step['description']}{dep_str}"
@@ -229,7 +263,8 @@ class SessionMemory:
         """Release all session data to free memory."""
         self.plan.clear()
         self.history.clear()
-        self.facts.clear()
+        self._facts.clear()
+        self._fact_set.clear()
         self.tool_results.clear()
         self.goal = ""
 
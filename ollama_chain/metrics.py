@@ -87,25 +87,25 @@ _TECHNICAL_TERMS = frozenset({
     "authentication", "authorization", "oauth", "jwt", "rbac",
 })
 
-_STRUCTURAL_MARKERS = (
+_STRUCTURAL_MARKERS = tuple(re.compile(p, re.MULTILINE) for p in (
     r"^\d+[\.\)]\s",        # numbered list
     r"^[-*]\s",             # bullet points
     r"^#{1,6}\s",           # markdown headers
     r"\n\n",                # paragraph breaks
     r"```",                 # code blocks
     r":\s*\n",              # key-value style
-)
+))
 
-_CONSTRAINT_PATTERNS = (
+_CONSTRAINT_PATTERNS = tuple(re.compile(p) for p in (
     r"\b(must|should|shall|require|need to|has to|ensure)\b",
     r"\b(at least|at most|no more than|no less than|exactly|within)\b",
     r"\b(maximum|minimum|limit|constraint|restrict|bound)\b",
     r"\b(format|output|return|respond|reply)\b.{0,20}\b(as|in|with|using)\b",
     r"\b(step[- ]by[- ]step|one by one|sequentially|in order)\b",
     r"\b(include|exclude|avoid|do not|don't|never|always)\b",
-)
+))
 
-_DELIMITER_PATTERNS = (
+_DELIMITER_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in (
     r"===",                   # section delimiters
     r"---",                   # horizontal rules
     r"```",                   # code fences
@@ -113,29 +113,53 @@ _DELIMITER_PATTERNS = (
     r"\|.*\|.*\|",           # table-style pipes
     r"^\s*#{1,6}\s",         # markdown headers as section delimiters
     r'"""',                   # triple-quote blocks
-)
+))
 
-_COT_PATTERNS = (
+_COT_PATTERNS = tuple(re.compile(p) for p in (
     r"\b(step[- ]by[- ]step|think.*through|reason.*through|show.*reasoning)\b",
     r"\b(let'?s think|walk.*through|break.*down|work.*through)\b",
-    r"\b(first.*then.*finally|explain.*reasoning|show.*work)\b",
+    r"\b(first(?>.*?then).*finally|explain.*reasoning|show.*work)\b",
     r"\b(why.*because|derive|prove|logical|implication)\b",
-)
+))
 
-_FEW_SHOT_PATTERNS = (
+_FEW_SHOT_PATTERNS = tuple(re.compile(p, re.MULTILINE | re.DOTALL) for p in (
     r"\b(example|e\.g\.|for instance|such as|sample|demo)\b",
     r"(input|output)\s*:",
-    r"(q|question|query)\s*:.*\n.*(a|answer|response)\s*:",
+    r"(q|question|query)\s*:[^\n]*\n.*(a|answer|response)\s*:",
     r"```\w*\n.*```",         # code blocks act as examples
-)
+))
 
-_DECOMPOSITION_PATTERNS = (
+_DECOMPOSITION_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in (
     r"^\s*\d+[\.\)]\s",       # numbered steps
     r"\b(first|second|third|then|next|finally|lastly)\b",
     r"\b(step\s*\d|phase\s*\d|part\s*\d)\b",
     r"\b(break.*down|decompose|sub-?tasks?|subtasks?)\b",
     r"\b(and also|additionally|furthermore|moreover)\b",
+))
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_PROPER_NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+_VERSION_RE = re.compile(r'\b\d+\.\d+')
+_URL_RE = re.compile(r'https?://')
+
+_CONTEXT_SIGNAL_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b(background|context|given|assuming|suppose|consider)\b',
+    r'\b(for example|e\.g\.|i\.e\.|such as|like)\b',
+    r'\b(because|since|due to|reason|purpose|goal)\b',
+    r'\b(versus|vs\.?|compared to|difference between|trade-?offs?)\b',
+    r'\b(use case|scenario|situation|environment|production|development)\b',
+))
+
+_NEEDS_REASONING_RE = re.compile(
+    r"\b(why|explain|analyze|compare|derive|prove|evaluate|"
+    r"reason|trade-?offs?|implications?|consequences?|assess)\b"
+)
+_NEEDS_EXAMPLES_RE = re.compile(
+    r"\b(classify|categorize|label|extract|parse|convert|"
+    r"translate|format|transform|rewrite|generate)\b"
 )
+_MULTI_PART_RE = re.compile(r"\b(and also|additionally|furthermore|moreover)\b")
 
 
 def _score_clarity(prompt: str, words: list[str]) -> MetricScore:
@@ -170,7 +194,7 @@ def _score_clarity(prompt: str, words: list[str]) -> MetricScore:
     elif vague_count == 0 and word_count >= 5:
         score += 0.1
 
-    sentences = re.split(r'[.!?]+', prompt)
+    sentences = _SENTENCE_SPLIT_RE.split(prompt)
     sentences = [s.strip() for s in sentences if s.strip()]
     if len(sentences) >= 2:
         score += 0.05
@@ -202,10 +226,10 @@ def _score_specificity(prompt: str, words: list[str]) -> MetricScore:
     else:
         explanation = "No domain-specific terminology detected"
 
-    has_numbers = bool(re.search(r'\b\d+\b', prompt))
-    has_names = bool(re.search(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', prompt))
-    has_versions = bool(re.search(r'\b\d+\.\d+', prompt))
-    has_urls = bool(re.search(r'https?://', prompt))
+    has_numbers = bool(_NUMBER_RE.search(prompt))
+    has_names = bool(_PROPER_NAME_RE.search(prompt))
+    has_versions = bool(_VERSION_RE.search(prompt))
+    has_urls = bool(_URL_RE.search(prompt))
     specifics = sum([has_numbers, has_names, has_versions, has_urls])
     score += specifics * 0.08
 
@@ -226,7 +250,7 @@ def _score_structure(prompt: str, words: list[str]) -> MetricScore:
     markers_found = 0
 
     for pattern in _STRUCTURAL_MARKERS:
-        if re.search(pattern, prompt, re.MULTILINE):
+        if pattern.search(prompt):
             markers_found += 1
 
     if markers_found >= 3:
@@ -264,7 +288,7 @@ def _score_actionability(prompt: str, words: list[str]) -> MetricScore:
 
     constraint_count = 0
     for pattern in _CONSTRAINT_PATTERNS:
-        matches = re.findall(pattern, prompt_lower)
+        matches = pattern.findall(prompt_lower)
         constraint_count += len(matches)
 
     if constraint_count >= 4:
@@ -301,16 +325,9 @@ def _score_context_sufficiency(prompt: str, words: list[str]) -> MetricScore:
 
     context_signals = 0
 
-    if re.search(r'\b(background|context|given|assuming|suppose|consider)\b', prompt_lower):
-        context_signals += 1
-    if re.search(r'\b(for example|e\.g\.|i\.e\.|such as|like)\b', prompt_lower):
-        context_signals += 1
-    if re.search(r'\b(because|since|due to|reason|purpose|goal)\b', prompt_lower):
-        context_signals += 1
-    if re.search(r'\b(versus|vs\.?|compared to|difference between|trade-?offs?)\b', prompt_lower):
-        context_signals += 1
-    if re.search(r'\b(use case|scenario|situation|environment|production|development)\b', prompt_lower):
-        context_signals += 1
+    for pattern in _CONTEXT_SIGNAL_PATTERNS:
+        if pattern.search(prompt_lower):
+            context_signals += 1
 
     if context_signals >= 3:
         score = 0.9
@@ -351,7 +368,7 @@ def _score_delimiter_usage(prompt: str, words: list[str]) -> MetricScore:
     delimiter_count = 0
 
     for pattern in _DELIMITER_PATTERNS:
-        if re.search(pattern, prompt, re.MULTILINE):
+        if pattern.search(prompt):
             delimiter_count += 1
 
     if word_count < 15:
@@ -389,15 +406,11 @@ def _score_cot_readiness(prompt: str, words: list[str]) -> MetricScore:
     prompt_lower = prompt.lower()
     word_count = len(words)
 
-    needs_reasoning = bool(re.search(
-        r"\b(why|explain|analyze|compare|derive|prove|evaluate|"
-        r"reason|trade-?offs?|implications?|consequences?|assess)\b",
-        prompt_lower,
-    ))
+    needs_reasoning = bool(_NEEDS_REASONING_RE.search(prompt_lower))
 
     cot_signals = 0
     for pattern in _COT_PATTERNS:
-        if re.search(pattern, prompt_lower):
+        if pattern.search(prompt_lower):
             cot_signals += 1
 
     if not needs_reasoning:
@@ -430,15 +443,11 @@ def _score_few_shot_readiness(prompt: str, words: list[str]) -> MetricScore:
     prompt_lower = prompt.lower()
     word_count = len(words)
 
-    needs_examples = bool(re.search(
-        r"\b(classify|categorize|label|extract|parse|convert|"
-        r"translate|format|transform|rewrite|generate)\b",
-        prompt_lower,
-    ))
+    needs_examples = bool(_NEEDS_EXAMPLES_RE.search(prompt_lower))
 
     example_signals = 0
     for pattern in _FEW_SHOT_PATTERNS:
-        if re.search(pattern, prompt_lower, re.MULTILINE | re.DOTALL):
+        if pattern.search(prompt_lower):
             example_signals += 1
 
     if not needs_examples:
@@ -474,12 +483,12 @@ def _score_task_decomposition(prompt: str, words: list[str]) -> MetricScore:
     is_complex = (
         word_count > 30
         or prompt.count("?") > 1
-        or bool(re.search(r"\b(and also|additionally|furthermore|moreover)\b", prompt_lower))
+        or bool(_MULTI_PART_RE.search(prompt_lower))
     )
 
     decomp_signals = 0
     for pattern in _DECOMPOSITION_PATTERNS:
-        if re.search(pattern, prompt_lower, re.MULTILINE):
+        if pattern.search(prompt_lower):
             decomp_signals += 1
 
     if not is_complex:
@@ -745,6 +754,13 @@ class ResponseMetrics:
         )
         return "\n".join(lines)
 
+_CITATION_PATTERNS = tuple(re.compile(p) for p in (
+    r'\[Source:.*?\]',
+    r'\[(?:RFC|ISO|IEEE|NIST|W3C)\s*\d+.*?\]',
+    r'https?://\S+',
+    r'\[\d+\]',
+))
+
 
 def evaluate_response(
     prompt: str, response: str, response_time_ms: float = 0.0,
@@ -752,18 +768,12 @@ def evaluate_response(
     """Evaluate the quality characteristics of a model response."""
     prompt_words = len(prompt.split())
     resp_words = len(response.split())
-    sentences = re.split(r'[.!?]+', response)
+    sentences = _SENTENCE_SPLIT_RE.split(response)
     sentences = [s.strip() for s in sentences if len(s.strip()) > 3]
 
-    citation_patterns = [
-        r'\[Source:.*?\]',
-        r'\[(?:RFC|ISO|IEEE|NIST|W3C)\s*\d+.*?\]',
-        r'https?://\S+',
-        r'\[\d+\]',
-    ]
     citation_count = 0
-    for pat in citation_patterns:
-        citation_count += len(re.findall(pat, response))
+    for pattern in _CITATION_PATTERNS:
+        citation_count += len(pattern.findall(response))
 
     return ResponseMetrics(
         response_length=len(response),
@@ -38,10 +38,14 @@ def _get(obj, key, default=None):
     return getattr(obj, key, default)
 
 
-def discover_models() -> list[ModelInfo]:
-    """Query Ollama API and return sorted list of available models (smallest first)."""
+def discover_models(client: ollama.Client | None = None) -> list[ModelInfo]:
+    """Query Ollama API and return sorted list of available models (smallest first).
+
+    Long-lived callers (the API server) pass their own *client* so the
+    HTTP connection to Ollama is kept alive and reused between calls.
+    """
     try:
-        response = ollama.list()
+        response = (client or ollama).list()
     except Exception as e:
         print(f"Error: cannot reach Ollama at localhost:11434 — {e}", file=sys.stderr)
         sys.exit(1)
@@ -242,8 +242,7 @@ def detect_parallel_groups(plan: list[dict]) -> list[list[dict]]:
         ready = []
         not_ready = []
         for step in remaining:
-            deps = set(step.get("depends_on", []))
-            if deps <= completed_ids:
+            if completed_ids.issuperset(step.get("depends_on") or ()):
                 ready.append(step)
             else:
                 not_ready.append(step)
@@ -61,6 +61,10 @@ _SIMPLE_PREFIXES = (
     "define ", "what port", "what does", "how many",
 )
 
+_CONJUNCTION_RE = re.compile(
+    " and also | additionally | furthermore | moreover ",
+)
+
 
 def classify_complexity_heuristic(query: str) -> tuple[str, float]:
     """Classify query complexity without an LLM call."""
@@ -68,16 +72,14 @@ def classify_complexity_heuristic(query: str) -> tuple[str, float]:
     words = query_lower.split()
     word_count = len(words)
 
-    if word_count <= 6 and any(query_lower.startswith(p) for p in _SIMPLE_PREFIXES):
+    if word_count <= 6 and query_lower.startswith(_SIMPLE_PREFIXES):
         return COMPLEXITY_SIMPLE, 0.80
 
     tech_count = sum(
         1 for w in words if w.strip(",.?!:;()") in _TECHNICAL_TERMS
     )
     multi_question = query.count("?") > 1
-    has_conjunctions = any(c in query_lower for c in (
-        " and also ", " additionally ", " furthermore ", " moreover ",
-    ))
+    has_conjunctions = _CONJUNCTION_RE.search(query_lower) is not None
 
     score = 0.0
     score += min(word_count / 12, 2.5)
@@ -282,8 +284,7 @@ def identify_parallel_candidates(plan: list[dict]) -> list[list[int]]:
         ready_ids: list[int] = []
         not_ready: list[dict] = []
         for step in remaining:
-            deps = set(step.get("depends_on", []))
-            if deps <= completed_ids:
+            if completed_ids.issuperset(step.get("depends_on") or ()):
                 ready_ids.append(step["id"])
             else:
                 not_ready.append(step)
@@ -11,16 +11,51 @@ which isolates model loading / unloading and makes cancellation safe.
 """
 
 import asyncio
+import atexit
+import gzip
 import logging
+import os
+import shutil
 import sys
+import tempfile
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 
 logger = logging.getLogger("ollama_chain.scheduler")
 
 _DEFAULT_JOB_TIMEOUT = 600  # seconds (10 minutes)
 
+# Progress lines kept in RAM per job.  Once a job accumulates more than
+# the high-water mark, everything but the most recent tail is appended to
+# a gzip spill file so long-running jobs have a bounded heap footprint.
+_PROGRESS_HIGH_WATER = 1000
+_PROGRESS_TAIL = 200
+# Private per-process directory (mkdtemp: mode 0o700, unpredictable name),
+# created on the first spill.  Job output must not land in a shared path
+# that other local users can read or pre-create.
+_SPILL_DIR: str | None = None
+
+
+def _spill_dir() -> str:
+    global _SPILL_DIR
+    if _SPILL_DIR is None:
+        _SPILL_DIR = tempfile.mkdtemp(prefix="ollama-chain-progress-")
+    return _SPILL_DIR
+
+
+def remove_spill_dir() -> None:
+    """Delete this process's spill directory and everything in it."""
+    global _SPILL_DIR
+    if _SPILL_DIR is not None:
+        shutil.rmtree(_SPILL_DIR, ignore_errors=True)
+        _SPILL_DIR = None
+
+
+atexit.register(remove_spill_dir)
+
 
 # ---------------------------------------------------------------------------
 # Job data model
@@ -40,9 +75,79 @@ class PromptJob:
     result: str | None = None
     error: str | None = None
     progress: list[str] = field(default_factory=list)
+    progress_offset: int = 0  # lines spilled to disk before progress[0]
     created_at: float = field(default_factory=time.time)
     started_at: float | None = None
     completed_at: float | None = None
+    spill_path: str | None = field(default=None, repr=False)
+
+    @property
+    def progress_total(self) -> int:
+        """Number of progress lines produced so far (in RAM + spilled)."""
+        return self.progress_offset + len(self.progress)
+
+    def add_progress(self, line: str) -> None:
+        """Append a progress line, spilling old lines to disk past the high-water mark."""
+        self.progress.append(line)
+        if len(self.progress) > _PROGRESS_HIGH_WATER:
+            self._spill()
+
+    def progress_from(self, start: int) -> list[str]:
+        """Return progress lines from absolute index *start* onwards.
+
+        Lines older than the in-memory tail are read back from the spill
+        file, so late SSE subscribers still see the full history.
+        """
+        start = max(start, 0)
+        lines: list[str] = []
+        if start < self.progress_offset:
+            lines = self.spilled_progress(start, self.progress_offset)
+        lines.extend(self.progress[max(start - self.progress_offset, 0):])
+        return lines
+
+    def spilled_progress(self, start: int, stop: int) -> list[str]:
+        """Return spilled lines ``[start, stop)``, decompressing the spill file.
+
+        Blocking; async callers should run it in an executor.  Lines read
+        before an error are still returned.
+        """
+        lines: list[str] = []
+        if not self.spill_path:
+            return lines
+        try:
+            # newline="\n": progress lines may contain a bare "\r", which
+            # universal-newline mode would split, shifting every index.
+            with gzip.open(
+                self.spill_path, "rt", encoding="utf-8", newline="\n",
+            ) as f:
+                for line in islice(f, start, stop):
+                    lines.append(line[:-1] if line.endswith("\n") else line)
+        except (OSError, EOFError) as e:
+            logger.warning("Job %s: cannot read progress spill: %s", self.id, e)
+        return lines
+
+    def discard_spill(self) -> None:
+        """Remove the on-disk spill file, if any."""
+        if self.spill_path:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+
+    def _spill(self) -> None:
+        n = len(self.progress) - _PROGRESS_TAIL
+        try:
+            if self.spill_path is None:
+                self.spill_path = os.path.join(_spill_dir(), f"{self.id}.log.gz")
+            # Each spill is written as its own gzip member, so the file is
+            # always readable even while the job keeps producing output.
+            with gzip.open(self.spill_path, "ab", compresslevel=1) as f:
+                f.write("".join(line + "\n" for line in self.progress[:n]).encode())
+        except OSError as e:
+            logger.warning("Job %s: cannot spill progress to disk: %s", self.id, e)
+            return
+        del self.progress[:n]
+        self.progress_offset += n
 
     def to_dict(self) -> dict:
         return {
@@ -51,6 +156,7 @@ class PromptJob:
             "result": self.result,
             "error": self.error,
             "progress": self.progress,
+            "progress_offset": self.progress_offset,
             "created_at": self.created_at,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
@@ -98,7 +204,10 @@ class Scheduler:
         self._semaphore = asyncio.Semaphore(max_concurrent)
         self._active_procs: dict[str, asyncio.subprocess.Process] = {}
         self._worker_tasks: list[asyncio.Task] = []
-        self._insertion_order: list[str] = []
+        # Job ids in submission order.  Ids at the head that are no longer
+        # queued are dropped lazily, so position lookups only walk the
+        # live part of the queue instead of every job ever submitted.
+        self._insertion_order: deque[str] = deque()
 
     # -- lifecycle -----------------------------------------------------------
 
@@ -119,10 +228,25 @@ class Scheduler:
                 logger.debug("Terminated subprocess for job %s", job_id)
             except ProcessLookupError:
                 pass
+        for job in self._jobs.values():
+            job.discard_spill()
+        remove_spill_dir()
 
     # -- public API ----------------------------------------------------------
 
     async def submit(self, prompt: str, mode: str, **kwargs) -> PromptJob:
+        return self._enqueue(prompt, mode, **kwargs)
+
+    async def submit_many(self, items: list[dict]) -> list[PromptJob]:
+        """Queue several prompts back-to-back, preserving their order.
+
+        Each item holds ``prompt``, ``mode`` and the optional keyword
+        arguments accepted by :meth:`submit`.  No other job can be queued
+        in between because nothing here yields to the event loop.
+        """
+        return [self._enqueue(**item) for item in items]
+
+    def _enqueue(self, prompt: str, mode: str, **kwargs) -> PromptJob:
         job = PromptJob(
             id=uuid.uuid4().hex[:12],
             prompt=prompt,
@@ -133,7 +257,7 @@ class Scheduler:
         )
         self._jobs[job.id] = job
         self._insertion_order.append(job.id)
-        await self._queue.put(job.id)
+        self._queue.put_nowait(job.id)
         logger.info(
             "Job %s submitted: mode=%s  web_search=%s  timeout=%ds  prompt=%.100s",
             job.id, mode, job.web_search, job.timeout, prompt,
@@ -162,6 +286,7 @@ class Scheduler:
 
     def queue_position(self, job_id: str) -> int:
         """0-based position among queued jobs, or -1 if not queued."""
+        self._prune_queue_head()
         pos = 0
         for jid in self._insertion_order:
             j = self._jobs.get(jid)
@@ -173,7 +298,11 @@ class Scheduler:
 
     @property
     def queue_size(self) -> int:
-        return sum(1 for j in self._jobs.values() if j.status == "queued")
+        self._prune_queue_head()
+        return sum(
+            1 for jid in self._insertion_order
+            if (j := self._jobs.get(jid)) and j.status == "queued"
+        )
 
     @property
     def active_count(self) -> int:
@@ -181,6 +310,14 @@ class Scheduler:
 
     # -- internals -----------------------------------------------------------
 
+    def _prune_queue_head(self) -> None:
+        order = self._insertion_order
+        while order:
+            j = self._jobs.get(order[0])
+            if j and j.status == "queued":
+                return
+            order.popleft()
+
     async def _worker(self) -> None:
         while True:
             job_id = await self._queue.get()
@@ -213,7 +350,7 @@ class Scheduler:
                 f"waiting for resources..."
             )
             logger.warning("Job %s: %s", job.id, msg)
-            job.progress.append(msg)
+            job.add_progress(msg)
             await asyncio.sleep(5)
             if job.status == "cancelled":
                 return
@@ -252,7 +389,7 @@ class Scheduler:
                 async for line in proc.stderr:
                     decoded = line.decode(errors="replace").strip()
                     if decoded:
-                        job.progress.append(decoded)
+                        job.add_progress(decoded)
                         logger.debug("Job %s [stderr]: %s", job.id, decoded)
 
             timed_out = False
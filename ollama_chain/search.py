@@ -5,8 +5,11 @@ every source are tagged, deduplicated, and merged into a single context
 block for LLM consumption.
 """
 
+import gzip
 import json
+import logging
 import sys
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -15,7 +18,10 @@ from dataclasses import dataclass, field
 
 from ddgs import DDGS
 
+logger = logging.getLogger("ollama_chain.search")
+
 _HTTP_TIMEOUT = 8  # seconds for GitHub / Stack Overflow API calls
+_GZIP_MAGIC = b"\x1f\x8b"
 
 TRUSTED_DOCS_DOMAINS = (
     "kubernetes.io", "docs.openshift.com", "docs.redhat.com",
@@ -27,7 +33,25 @@ TRUSTED_DOCS_DOMAINS = (
 )
 
 
-@dataclass
+# DDGS keeps one HTTP client per engine, so reusing an instance keeps its
+# connections (and TLS sessions) alive across calls and retries.  Instances
+# are per thread because search calls run concurrently on worker pools.
+_local = threading.local()
+
+
+def _ddgs() -> DDGS:
+    ddgs = getattr(_local, "ddgs", None)
+    if ddgs is None:
+        ddgs = _local.ddgs = DDGS()
+    return ddgs
+
+
+def _drop_ddgs() -> None:
+    """Forget this thread's client so the next call starts from a fresh one."""
+    _local.ddgs = None
+
+
+@dataclass(slots=True)
 class SearchResult:
     title: str
     url: str
@@ -38,10 +62,11 @@ class SearchResult:
 def web_search(query: str, max_results: int = 5) -> list[SearchResult]:
     """Search DuckDuckGo and return top results."""
     try:
-        ddgs = DDGS()
+        ddgs = _ddgs()
         raw = list(ddgs.text(query, max_results=max_results))
     except Exception as e:
-        print(f"[search] Warning: web search failed — {e}", file=sys.stderr)
+        _drop_ddgs()
+        logger.warning("[search] Warning: web search failed — %s", e)
         return []
 
     results = []
@@ -58,10 +83,11 @@ def web_search(query: str, max_results: int = 5) -> list[SearchResult]:
 def web_search_news(query: str, max_results: int = 5) -> list[SearchResult]:
     """Search DuckDuckGo news for recent/time-sensitive queries."""
     try:
-        ddgs = DDGS()
+        ddgs = _ddgs()
         raw = list(ddgs.news(query, max_results=max_results))
     except Exception as e:
-        print(f"[search] Warning: news search failed — {e}", file=sys.stderr)
+        _drop_ddgs()
+        logger.warning("[search] Warning: news search failed — %s", e)
         return []
 
     results = []
@@ -96,7 +122,7 @@ def github_search(query: str, max_results: int = 5) -> list[SearchResult]:
         with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
             data = json.loads(resp.read().decode())
     except Exception as e:
-        print(f"[search] Warning: GitHub search failed — {e}", file=sys.stderr)
+        logger.warning("[search] Warning: GitHub search failed — %s", e)
         return []
 
     results: list[SearchResult] = []
@@ -139,7 +165,7 @@ def github_search_issues(
         with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
             data = json.loads(resp.read().decode())
     except Exception as e:
-        print(f"[search] Warning: GitHub issue search failed — {e}", file=sys.stderr)
+        logger.warning("[search] Warning: GitHub issue search failed — %s", e)
         return []
 
     results: list[SearchResult] = []
@@ -181,14 +207,11 @@ def stackoverflow_search(
     try:
         with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
             raw = resp.read()
-            import gzip
-            try:
+            if raw[:2] == _GZIP_MAGIC:  # the API gzips regardless of Accept-Encoding
                 raw = gzip.decompress(raw)
-            except Exception:
-                pass
             data = json.loads(raw.decode())
     except Exception as e:
-        print(f"[search] Warning: Stack Overflow search failed — {e}", file=sys.stderr)
+        logger.warning("[search] Warning: Stack Overflow search failed — %s", e)
         return []
 
     results: list[SearchResult] = []
@@ -220,10 +243,11 @@ def docs_search(
     site_clause = " OR ".join(f"site:{d}" for d in domains[:8])
     scoped_query = f"{query} ({site_clause})"
     try:
-        ddgs = DDGS()
+        ddgs = _ddgs()
         raw = list(ddgs.text(scoped_query, max_results=max_results))
     except Exception as e:
-        print(f"[search] Warning: docs search failed — {e}", file=sys.stderr)
+        _drop_ddgs()
+        logger.warning("[search] Warning: docs search failed — %s", e)
         return []
 
     results: list[SearchResult] = []
@@ -8,6 +8,7 @@ Start with::
 Endpoints
 ---------
 POST   /api/prompt              Submit a prompt → {job_id, status, position}
+POST   /api/prompt/batch        Submit {prompts: [...]} → {jobs: [...]}
 GET    /api/prompt/{job_id}     Poll job status → full job dict
 GET    /api/prompt/{job_id}/stream  SSE stream of progress + final result
 DELETE /api/prompt/{job_id}     Cancel a running/queued job
@@ -27,12 +28,15 @@ import json
 import logging
 import os
 import sys
+import threading
 import time as _time
 
+import ollama
 from aiohttp import web
 
 from .chains import CLI_ONLY_MODES
-from .scheduler import Scheduler
+from .models import discover_models, model_names
+from .scheduler import PromptJob, Scheduler
 
 logger = logging.getLogger("ollama_chain.server")
 
@@ -51,6 +55,28 @@ _LOG_FORMAT = (
 _LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders ``asctime`` at most once per wall-clock second.
+
+    Records logged within the same second share the cached string, which
+    saves a ``localtime`` + ``strftime`` call per record on busy servers.
+    The cache is per thread: handlers are called from the event loop and
+    from executor threads without a lock around ``format``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        cached = getattr(self._local, "cached", None)
+        if cached is None or cached[0] != sec:
+            cached = (sec, super().formatTime(record, datefmt))
+            self._local.cached = cached
+        return cached[1]
+
+
 def setup_logging(log_dir: str = ".logs") -> str:
     """Configure root logger with a DEBUG file handler and an INFO console handler.
 
@@ -65,14 +91,16 @@ def setup_logging(log_dir: str = ".logs") -> str:
     if root.handlers:
         root.handlers.clear()
 
+    formatter = _CachedTimeFormatter(_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT)
+
     fh = logging.FileHandler(log_file, encoding="utf-8")
     fh.setLevel(logging.DEBUG)
-    fh.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT))
+    fh.setFormatter(formatter)
     root.addHandler(fh)
 
     ch = logging.StreamHandler(sys.stderr)
     ch.setLevel(logging.INFO)
-    ch.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT))
+    ch.setFormatter(formatter)
     root.addHandler(ch)
 
     logging.getLogger("aiohttp.access").setLevel(logging.DEBUG)
@@ -84,16 +112,17 @@ def setup_logging(log_dir: str = ".logs") -> str:
 # Middleware
 # ---------------------------------------------------------------------------
 
+_CORS_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
 @web.middleware
 async def cors_middleware(request: web.Request, handler):
     if request.method == "OPTIONS":
-        return web.Response(
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, DELETE, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type",
-            },
-        )
+        return web.Response(headers=_CORS_PREFLIGHT_HEADERS)
     response = await handler(request)
     response.headers["Access-Control-Allow-Origin"] = "*"
     return response
@@ -145,22 +174,30 @@ async def health(request: web.Request) -> web.Response:
     return web.json_response(data)
 
 
-async def submit_prompt(request: web.Request) -> web.Response:
-    try:
-        data = await request.json()
-    except Exception:
-        logger.warning("Invalid JSON body from %s", request.remote)
-        raise web.HTTPBadRequest(text="Invalid JSON body")
+# Fixed error bodies for rejected submissions.  The exceptions themselves
+# are created per request: aiohttp prepares a raised HTTPException as the
+# response, so a shared instance cannot be sent twice.
+_ERR_BAD_JSON = "Invalid JSON body"
+_ERR_NO_PROMPT = "Missing 'prompt' field"
+
+
+_MAX_BATCH_SIZE = 64
+
 
+def _parse_prompt_body(data: dict, remote: str | None) -> dict:
+    """Validate one prompt submission and return ``Scheduler.submit`` arguments.
+
+    Raises ``web.HTTPBadRequest`` when the body is unusable.
+    """
     prompt = data.get("prompt", "").strip()
     if not prompt:
-        logger.warning("Empty prompt from %s", request.remote)
-        raise web.HTTPBadRequest(text="Missing 'prompt' field")
+        logger.warning("Empty prompt from %s", remote)
+        raise web.HTTPBadRequest(text=_ERR_NO_PROMPT)
 
     mode = data.get("mode", "cascade")
     if mode in CLI_ONLY_MODES:
         logger.warning(
-            "Rejected CLI-only mode '%s' from %s", mode, request.remote,
+            "Rejected CLI-only mode '%s' from %s", mode, remote,
         )
         raise web.HTTPBadRequest(
             text=f"Mode '{mode}' is only available via the CLI"
@@ -171,15 +208,32 @@ async def submit_prompt(request: web.Request) -> web.Response:
     if not isinstance(timeout, (int, float)) or timeout <= 0:
         timeout = scheduler._default_job_timeout
     timeout = min(int(timeout), 3600)
+    return {
+        "prompt": prompt,
+        "mode": mode,
+        "web_search": ws,
+        "max_iterations": max_iter,
+        "timeout": timeout,
+    }
 
+
+def _log_new_prompt(job: PromptJob) -> None:
+    """Log a prompt once it has actually been queued."""
     logger.info(
         "New prompt: mode=%s  web_search=%s  max_iter=%d  timeout=%ds  prompt=%.120s",
-        mode, ws, max_iter, timeout, prompt,
+        job.mode, job.web_search, job.max_iterations, job.timeout, job.prompt,
     )
 
-    job = await scheduler.submit(
-        prompt, mode, web_search=ws, max_iterations=max_iter, timeout=timeout,
-    )
+
+async def submit_prompt(request: web.Request) -> web.Response:
+    try:
+        data = await request.json()
+    except Exception:
+        logger.warning("Invalid JSON body from %s", request.remote)
+        raise web.HTTPBadRequest(text=_ERR_BAD_JSON) from None
+
+    job = await scheduler.submit(**_parse_prompt_body(data, request.remote))
+    _log_new_prompt(job)
     logger.info("Job %s queued (position %d)", job.id, scheduler.queue_position(job.id))
     return web.json_response(
         {
@@ -191,6 +245,56 @@ async def submit_prompt(request: web.Request) -> web.Response:
     )
 
 
+async def submit_prompt_batch(request: web.Request) -> web.Response:
+    """Submit up to ``_MAX_BATCH_SIZE`` prompts in one request.
+
+    The whole batch is validated before anything is queued, so a bad
+    item rejects the request without leaving partial submissions behind.
+    """
+    try:
+        data = await request.json()
+    except Exception:
+        logger.warning("Invalid JSON body from %s", request.remote)
+        raise web.HTTPBadRequest(text=_ERR_BAD_JSON) from None
+
+    prompts = data.get("prompts") if isinstance(data, dict) else None
+    if not isinstance(prompts, list) or not prompts:
+        logger.warning("Empty batch from %s", request.remote)
+        raise web.HTTPBadRequest(text="Missing 'prompts' list")
+    if len(prompts) > _MAX_BATCH_SIZE:
+        logger.warning("Oversized batch (%d) from %s", len(prompts), request.remote)
+        raise web.HTTPBadRequest(
+            text=f"Batch too large ({len(prompts)} > {_MAX_BATCH_SIZE})"
+        )
+
+    items = []
+    for i, item in enumerate(prompts):
+        if not isinstance(item, dict):
+            raise web.HTTPBadRequest(text=f"prompts[{i}]: expected an object")
+        try:
+            items.append(_parse_prompt_body(item, request.remote))
+        except web.HTTPBadRequest as exc:
+            raise web.HTTPBadRequest(text=f"prompts[{i}]: {exc.text}") from None
+
+    jobs = await scheduler.submit_many(items)
+    for job in jobs:
+        _log_new_prompt(job)
+    logger.info("Batch of %d job(s) queued from %s", len(jobs), request.remote)
+    return web.json_response(
+        {
+            "jobs": [
+                {
+                    "job_id": job.id,
+                    "status": job.status,
+                    "position": scheduler.queue_position(job.id),
+                }
+                for job in jobs
+            ],
+        },
+        status=202,
+    )
+
+
 async def get_job(request: web.Request) -> web.Response:
     job_id = request.match_info["job_id"]
     job = scheduler.get(job_id)
@@ -207,6 +311,61 @@ async def get_job(request: web.Request) -> web.Response:
 _TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled", "timed_out"})
 
 
+def _resume_index(request: web.Request) -> int:
+    """First progress index to send, honouring an SSE ``Last-Event-ID`` header."""
+    try:
+        return int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        return 0
+
+
+_SSE_CHUNK_THRESHOLD = 64 * 1024
+_SSE_CHUNK_SIZE = 16 * 1024
+
+
+async def _write_chunked(response: web.StreamResponse, data: bytes) -> None:
+    """Write *data*, slicing large payloads so each write can drain.
+
+    Slices are ``memoryview`` windows over *data*, so no copies are made.
+    """
+    if len(data) <= _SSE_CHUNK_THRESHOLD:
+        await response.write(data)
+        return
+    view = memoryview(data)
+    for off in range(0, len(view), _SSE_CHUNK_SIZE):
+        await response.write(view[off:off + _SSE_CHUNK_SIZE])
+
+
+def _sse_progress(idx: int, line: str) -> bytes:
+    return f"id: {idx}\nevent: progress\ndata: {json.dumps({'line': line})}\n\n".encode()
+
+
+async def _write_progress(
+    response: web.StreamResponse, job: PromptJob, start: int,
+) -> int:
+    """Send progress events from absolute index *start*; return the next index.
+
+    Spilled history is decompressed in the default executor so a resuming
+    client does not stall the event loop.  When spilled lines cannot be
+    read they are skipped, keeping event ids aligned with line indices.
+    """
+    start = max(start, 0)
+    offset = job.progress_offset
+    if start < offset:
+        loop = asyncio.get_running_loop()
+        lines = await loop.run_in_executor(
+            None, job.spilled_progress, start, offset,
+        )
+        for idx, line in enumerate(lines, start):
+            await response.write(_sse_progress(idx, line))
+        # More may have spilled meanwhile; the caller comes back for it.
+        return start + len(lines) if lines else offset
+    for line in job.progress[start - offset:]:
+        await response.write(_sse_progress(start, line))
+        start += 1
+    return start
+
+
 async def stream_job(request: web.Request) -> web.StreamResponse:
     """Server-Sent Events stream for a job.
 
@@ -216,8 +375,10 @@ async def stream_job(request: web.Request) -> web.StreamResponse:
     infinite reconnection loop when they miss the terminal event.
 
     Events emitted (SSE):
-      queued    – {position}  while waiting in queue
-      progress  – {line}      stderr lines from the chain subprocess
+      queued    – {position}  while waiting in queue, whenever it changes
+      progress  – {line}      stderr lines from the chain subprocess; the
+                              event id is the line index, so reconnecting
+                              with ``Last-Event-ID`` resumes after it
       complete  – {result}    final answer text
       timed_out – {error, partial_result}  job exceeded its timeout
       error     – {error}     if the chain failed
@@ -251,31 +412,31 @@ async def stream_job(request: web.Request) -> web.StreamResponse:
     )
     await response.prepare(request)
 
-    last_idx = 0
+    last_idx = _resume_index(request)
+    last_pos: int | None = None
     last_write = _time.monotonic()
     _ACTIVE_STATUSES = ("queued", "running")
     while job.status in _ACTIVE_STATUSES:
         wrote_something = False
-        while last_idx < len(job.progress):
-            line = job.progress[last_idx]
-            await response.write(
-                f"event: progress\ndata: {json.dumps({'line': line})}\n\n".encode()
-            )
-            last_idx += 1
+        if last_idx < job.progress_total:
+            last_idx = await _write_progress(response, job, last_idx)
             wrote_something = True
 
         if job.status == "queued":
             pos = scheduler.queue_position(job_id)
-            await response.write(
-                f"event: queued\ndata: {json.dumps({'position': pos})}\n\n".encode()
-            )
-            wrote_something = True
+            if pos != last_pos:
+                await response.write(
+                    f"event: queued\ndata: {json.dumps({'position': pos})}\n\n".encode()
+                )
+                last_pos = pos
+                wrote_something = True
 
         now = _time.monotonic()
         if wrote_something:
             last_write = now
         elif now - last_write >= _SSE_HEARTBEAT_INTERVAL:
-            elapsed = now - (job.started_at or job.created_at)
+            # Job timestamps are wall-clock; ``now`` is monotonic.
+            elapsed = _time.time() - (job.started_at or job.created_at)
             await response.write(
                 f": keepalive {elapsed:.0f}s\n\n".encode()
             )
@@ -284,16 +445,13 @@ async def stream_job(request: web.Request) -> web.StreamResponse:
 
         await asyncio.sleep(0.3)
 
-    while last_idx < len(job.progress):
-        line = job.progress[last_idx]
-        await response.write(
-            f"event: progress\ndata: {json.dumps({'line': line})}\n\n".encode()
-        )
-        last_idx += 1
+    while last_idx < job.progress_total:
+        last_idx = await _write_progress(response, job, last_idx)
 
     if job.status == "completed":
-        await response.write(
-            f"event: complete\ndata: {json.dumps({'result': job.result})}\n\n".encode()
+        await _write_chunked(
+            response,
+            f"event: complete\ndata: {json.dumps({'result': job.result})}\n\n".encode(),
         )
     elif job.status == "timed_out":
         payload = {"error": job.error or "Job timed out", "partial_result": job.result}
@@ -324,10 +482,8 @@ async def cancel_job(request: web.Request) -> web.Response:
 
 
 async def list_models(request: web.Request) -> web.Response:
-    from .models import discover_models, model_names
-
     try:
-        models = discover_models()
+        models = discover_models(request.app.get("ollama_client"))
         names = model_names(models)
     except SystemExit:
         logger.error("Cannot reach Ollama (model discovery failed)")
@@ -347,11 +503,15 @@ async def list_models(request: web.Request) -> web.Response:
 async def on_startup(app: web.Application) -> None:
     logger.info("Scheduler starting (%d worker(s))", scheduler._max_concurrent)
     scheduler.start()
+    app["ollama_client"] = ollama.Client()
 
 
 async def on_shutdown(app: web.Application) -> None:
     logger.info("Scheduler shutting down")
     await scheduler.shutdown()
+    client = app.get("ollama_client")
+    if client is not None:
+        client.close()
     logger.info("Server stopped")
 
 
@@ -369,6 +529,7 @@ def create_app(max_concurrent: int = 1,
 
     app.router.add_get("/api/health", health)
     app.router.add_post("/api/prompt", submit_prompt)
+    app.router.add_post("/api/prompt/batch", submit_prompt_batch)
     app.router.add_get("/api/prompt/{job_id}", get_job)
     app.router.add_get("/api/prompt/{job_id}/stream", stream_job)
     app.router.add_delete("/api/prompt/{job_id}", cancel_job)
@@ -6,14 +6,31 @@ uniform ToolResult interface so the agent loop can invoke any of them by name.
 Resilience features (Gap 3):
   - Per-tool retry with configurable attempts
   - Fallback chains: when a tool fails, alternatives are tried automatically
+  - Hedged search fallbacks: a slow search races its fallbacks
+  - Circuit breaker: a search tool that keeps failing is skipped for a while
+  - Short-lived caches of search and read-only tool results
   - Structured error metadata on ToolResult
 """
 
+import ast
+import atexit
+import functools
+import logging
+import math
 import os
+import random
+import re
+import selectors
+import shlex
 import subprocess
-import sys
+import threading
 import time
-from dataclasses import dataclass, field
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait,
+)
+from dataclasses import dataclass, field, replace
 from typing import Callable
 
 from .search import (
@@ -22,12 +39,14 @@ from .search import (
     docs_search,
 )
 
+logger = logging.getLogger("ollama_chain.tools")
+
 
 # ---------------------------------------------------------------------------
 # Result / Tool dataclasses
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     success: bool
     output: str
@@ -35,9 +54,10 @@ class ToolResult:
     duration_ms: float = 0.0
     retries_used: int = 0
     error_detail: str = ""
+    backoff_ms_total: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Tool:
     name: str
     description: str
@@ -45,29 +65,125 @@ class Tool:
     function: Callable[..., ToolResult]
     max_retries: int = 1
     retry_delay: float = 1.0
+    max_retry_delay: float = 30.0
+    cache_ttl: float = 0.0  # seconds a successful result is reused; 0 = never
 
 
 # ---------------------------------------------------------------------------
 # Tool implementations
 # ---------------------------------------------------------------------------
 
+_MAX_SHELL_OUTPUT = 100_000  # bytes kept per stream before the command is killed
+_SHELL_READ_CHUNK = 8192
+
+
+def _collect_output(
+    proc: subprocess.Popen, timeout: float,
+) -> tuple[bytes, bytes, bool]:
+    """Read stdout/stderr of *proc* until EOF, the output cap, or *timeout*.
+
+    Returns ``(stdout, stderr, truncated)``.  Reading is incremental, so a
+    command that floods its output is killed once a stream exceeds
+    ``_MAX_SHELL_OUTPUT`` instead of being buffered in full.  Raises
+    ``subprocess.TimeoutExpired`` (after killing the process) on timeout.
+    """
+    bufs = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+    deadline = time.monotonic() + timeout
+    truncated = False
+    with selectors.DefaultSelector() as sel:
+        for pipe in bufs:
+            sel.register(pipe, selectors.EVENT_READ)
+        while sel.get_map() and not truncated:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.kill()
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            for key, _ in sel.select(remaining):
+                chunk = os.read(key.fd, _SHELL_READ_CHUNK)
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    continue
+                buf = bufs[key.fileobj]
+                buf += chunk
+                if len(buf) > _MAX_SHELL_OUTPUT:
+                    del buf[_MAX_SHELL_OUTPUT:]
+                    truncated = True
+    if truncated:
+        proc.kill()
+    try:
+        proc.wait(timeout=max(deadline - time.monotonic(), 0.1))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        raise
+    return bytes(bufs[proc.stdout]), bytes(bufs[proc.stderr]), truncated
+
+
+# Commands without shell syntax are exec'd directly, saving the /bin/sh
+# fork+exec and parse.  Anything that might need the shell (pipes,
+# redirection, expansion, globbing, builtins, VAR=value prefixes) still
+# goes through it.
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "alias", "bg", "break", "case", "cd", "command", "continue",
+    "eval", "exec", "exit", "export", "fg", "for", "function", "getopts",
+    "hash", "if", "jobs", "read", "readonly", "return", "set", "shift",
+    "source", "time", "times", "trap", "type", "ulimit", "umask", "unalias",
+    "unset", "until", "wait", "while",
+})
+
+
+def _direct_argv(command: str) -> list[str] | None:
+    """Split *command* into an argv if it needs no shell, else None."""
+    if _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or "=" in argv[0] or argv[0] in _SHELL_BUILTINS:
+        return None
+    return argv
+
+
+def _spawn_shell(command: str) -> subprocess.Popen:
+    argv = _direct_argv(command)
+    if argv is not None:
+        try:
+            return subprocess.Popen(
+                argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+        except OSError:
+            pass  # not found / not executable: let the shell report it
+    return subprocess.Popen(
+        command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+
+
 def tool_shell(command: str, timeout: int = 30) -> ToolResult:
     """Execute a shell command and return combined stdout/stderr."""
     try:
-        result = subprocess.run(
-            command, shell=True, capture_output=True, text=True,
-            timeout=timeout,
-        )
-        output = result.stdout
-        if result.stderr:
-            output += f"\n[stderr] {result.stderr}"
-        if result.returncode != 0:
-            output += f"\n[exit code: {result.returncode}]"
+        with _spawn_shell(command) as proc:
+            raw_out, raw_err, truncated = _collect_output(proc, timeout)
+        stdout = raw_out.decode(errors="replace").strip()
+        stderr = raw_err.decode(errors="replace").strip()
+        returncode = proc.returncode
+        parts = [stdout] if stdout else []
+        if stderr:
+            parts.append(f"[stderr] {stderr}")
+        # A truncated command was killed by us, so its exit status says
+        # nothing about whether it worked; report the truncation instead.
+        error_detail = ""
+        if truncated:
+            parts.append(f"... [output truncated at {_MAX_SHELL_OUTPUT} bytes, command killed]")
+            error_detail = "truncated"
+        elif returncode != 0:
+            parts.append(f"[exit code: {returncode}]")
+            error_detail = f"exit {returncode}"
         return ToolResult(
-            success=result.returncode == 0,
-            output=output.strip() or "(no output)",
+            success=not error_detail,
+            output="\n".join(parts) if parts else "(no output)",
             tool_name="shell",
-            error_detail="" if result.returncode == 0 else f"exit {result.returncode}",
+            error_detail=error_detail,
         )
     except subprocess.TimeoutExpired:
         return ToolResult(
@@ -78,15 +194,64 @@ def tool_shell(command: str, timeout: int = 30) -> ToolResult:
         return ToolResult(False, str(e), "shell", error_detail=type(e).__name__)
 
 
+_MAX_READ_BYTES = 50_000
+
+# Resolved once: expanduser() may hit the passwd database on every call
+# when $HOME is unset.
+_HOME = os.path.expanduser("~")
+
+
+def _expand(path: str) -> str:
+    """``os.path.expanduser`` against the cached home directory."""
+    if path == "~":
+        return _HOME
+    if path.startswith("~/"):
+        return _HOME + path[1:]
+    if path.startswith("~"):  # ~user form
+        return os.path.expanduser(path)
+    return path
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _read_head(fd: int, limit: int) -> bytes:
+    """Read up to *limit* bytes with plain ``read`` calls."""
+    buf = bytearray()
+    while len(buf) < limit:
+        chunk = os.read(fd, limit - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
 def tool_read_file(path: str) -> ToolResult:
-    """Read a file and return its contents (truncated at 50 kB)."""
+    """Read a file and return its contents (truncated at 50 kB).
+
+    Only the first ``_MAX_READ_BYTES`` are read, so the cost does not grow
+    with file size.  Plain ``read`` calls are used rather than ``mmap``:
+    sysfs attributes report a size but cannot be mapped, and a mapped file
+    truncated by another process would fault the whole interpreter.
+    """
     try:
-        path = os.path.expanduser(path)
-        with open(path) as f:
-            content = f.read()
-        if len(content) > 50_000:
-            content = content[:50_000] + "\n... [truncated, file too large]"
-        return ToolResult(True, content or "(empty file)", "read_file")
+        path = _expand(path)
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            data = _read_head(fd, _MAX_READ_BYTES + 1)
+        finally:
+            os.close(fd)
+        truncated = len(data) > _MAX_READ_BYTES
+        data = data[:_MAX_READ_BYTES]
+        if not data:
+            return ToolResult(True, "(empty file)", "read_file")
+        content = data.decode("utf-8", errors="replace")
+        if truncated:
+            content += "\n... [truncated, file too large]"
+        return ToolResult(True, content, "read_file")
     except Exception as e:
         return ToolResult(
             False, str(e), "read_file", error_detail=type(e).__name__,
@@ -94,15 +259,28 @@ def tool_read_file(path: str) -> ToolResult:
 
 
 def tool_write_file(path: str, content: str) -> ToolResult:
-    """Write content to a file, creating parent directories as needed."""
+    """Write content to a file, creating parent directories as needed.
+
+    The parent directories are only created when the first open fails,
+    so writes into an existing directory cost a single ``open``.
+    """
     try:
-        path = os.path.expanduser(path)
-        parent = os.path.dirname(path)
-        if parent:
+        path = _expand(path)
+        data = content.encode("utf-8")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC
+        try:
+            fd = os.open(path, flags, 0o666)
+        except FileNotFoundError:
+            parent = os.path.dirname(path)
+            if not parent:
+                raise
             os.makedirs(parent, exist_ok=True)
-        with open(path, "w") as f:
-            f.write(content)
-        return ToolResult(True, f"Written {len(content)} bytes to {path}", "write_file")
+            fd = os.open(path, flags, 0o666)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        return ToolResult(True, f"Written {len(data)} bytes to {path}", "write_file")
     except Exception as e:
         return ToolResult(
             False, str(e), "write_file", error_detail=type(e).__name__,
@@ -112,31 +290,204 @@ def tool_write_file(path: str, content: str) -> ToolResult:
 def tool_append_file(path: str, content: str) -> ToolResult:
     """Append content to an existing file."""
     try:
-        path = os.path.expanduser(path)
-        with open(path, "a") as f:
-            f.write(content)
-        return ToolResult(True, f"Appended {len(content)} bytes to {path}", "append_file")
+        path = _expand(path)
+        data = content.encode("utf-8")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o666)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        return ToolResult(True, f"Appended {len(data)} bytes to {path}", "append_file")
     except Exception as e:
         return ToolResult(
             False, str(e), "append_file", error_detail=type(e).__name__,
         )
 
 
-def tool_list_dir(path: str = ".") -> ToolResult:
-    """List directory contents."""
+_MAX_LISTDIR = 10_000  # entries shown before the listing is cut short
+
+
+def _entry_name(entry: os.DirEntry) -> str:
+    try:
+        return entry.name + "/" if entry.is_dir() else entry.name
+    except OSError:
+        return entry.name
+
+
+def tool_list_dir(path: str = ".", sort: bool = True) -> ToolResult:
+    """List directory contents.
+
+    Directories are marked with a trailing ``/`` (from the entry type the
+    kernel already returned, so no extra ``stat``).  At most
+    ``_MAX_LISTDIR`` names are returned.  With *sort* off, entries come
+    back in directory order and the names past the cap are only counted,
+    so huge directories are listed in bounded memory.
+    """
+    if isinstance(sort, str):
+        sort = sort.strip().lower() not in ("false", "0", "no")
     try:
-        path = os.path.expanduser(path)
-        entries = sorted(os.listdir(path))
-        return ToolResult(True, "\n".join(entries) or "(empty directory)", "list_dir")
+        path = _expand(path)
+        with os.scandir(path) as it:
+            if sort:
+                entries = [_entry_name(e) for e in it]
+                entries.sort()
+                extra = len(entries) - _MAX_LISTDIR
+                del entries[_MAX_LISTDIR:]
+            else:
+                entries = []
+                extra = 0
+                for e in it:
+                    if len(entries) < _MAX_LISTDIR:
+                        entries.append(_entry_name(e))
+                    else:
+                        extra += 1
+        if not entries:
+            return ToolResult(True, "(empty directory)", "list_dir")
+        if extra > 0:
+            entries.append(f"... {extra} more")
+        return ToolResult(True, "\n".join(entries), "list_dir")
     except Exception as e:
         return ToolResult(
             False, str(e), "list_dir", error_detail=type(e).__name__,
         )
 
 
+# Search providers block on the network with no overall deadline, so each
+# call runs on a shared worker pool and is abandoned after a timeout.  The
+# timeout adapts per provider to an EWMA of observed latency (mean + 3σ),
+# clamped to [_MIN_WEB_TOOL_TIMEOUT, _WEB_TOOL_TIMEOUT], so a normally fast
+# provider that stalls gives up early and its fallbacks start sooner.
+_WEB_TOOL_TIMEOUT = 20  # seconds
+_MIN_WEB_TOOL_TIMEOUT = 2.0
+_LATENCY_ALPHA = 0.1
+_LATENCY_MIN_SAMPLES = 5
+_SEARCH_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("OLLAMA_CHAIN_POOL", "16")),
+    thread_name_prefix="search",
+)
+atexit.register(_SEARCH_POOL.shutdown, wait=False)
+# Calls admitted to the pool (running or queued).  A burst beyond this is
+# rejected instead of queueing behind stalled providers: a small bounded
+# fan-out finishes sooner overall than a wide one that piles up timeouts.
+_SEARCH_QUEUE_CAP = 32
+_SEARCH_SLOTS = threading.BoundedSemaphore(_SEARCH_QUEUE_CAP)
+
+
+class _PoolSaturated(RuntimeError):
+    error_detail = "pool_saturated"
+
+
+# The agent often repeats a query within one session, so non-empty provider
+# results are kept for _SEARCH_CACHE_TTL seconds in a small LRU keyed by
+# provider and normalized arguments.  Timeouts and failures are not cached.
+_SEARCH_CACHE_SIZE = 256
+_SEARCH_CACHE_TTL = 300.0
+_SEARCH_CACHE: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _search_cache_key(fn: Callable, args: tuple, kwargs: dict) -> tuple:
+    norm = tuple(
+        " ".join(a.split()).lower() if isinstance(a, str) else a for a in args
+    )
+    return fn, norm, tuple(sorted(kwargs.items()))
+
+
+def clear_search_cache() -> None:
+    """Drop all cached search results."""
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE.clear()
+
+
+@dataclass(slots=True)
+class _LatencyStats:
+    ewma: float = 0.0  # seconds
+    var: float = 0.0
+    samples: int = 0
+
+
+_LATENCY: dict[str, _LatencyStats] = {}
+_LATENCY_LOCK = threading.Lock()
+
+
+def _adaptive_timeout(key: str) -> float:
+    with _LATENCY_LOCK:
+        stats = _LATENCY.get(key)
+        if stats is None or stats.samples < _LATENCY_MIN_SAMPLES:
+            return _WEB_TOOL_TIMEOUT
+        dyn = stats.ewma + 3 * math.sqrt(stats.var)
+    return min(_WEB_TOOL_TIMEOUT, max(_MIN_WEB_TOOL_TIMEOUT, dyn))
+
+
+def _record_latency(key: str, seconds: float) -> None:
+    with _LATENCY_LOCK:
+        stats = _LATENCY.setdefault(key, _LatencyStats())
+        if stats.samples == 0:
+            stats.ewma = seconds
+        else:
+            diff = seconds - stats.ewma
+            stats.ewma += _LATENCY_ALPHA * diff
+            stats.var = (1 - _LATENCY_ALPHA) * (stats.var + _LATENCY_ALPHA * diff * diff)
+        stats.samples += 1
+
+
+def _run_search_with_timeout(fn: Callable, *args, **kwargs) -> list | None:
+    """Run a search provider on the shared pool.  Returns None on timeout.
+
+    Recent results for the same query are served from ``_SEARCH_CACHE``.
+    Raises ``_PoolSaturated`` when ``_SEARCH_QUEUE_CAP`` calls are already
+    in flight.  A slot is held until the provider call actually finishes,
+    not merely until the caller stops waiting for it.
+    """
+    cache_key = _search_cache_key(fn, args, kwargs)
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(cache_key)
+        if hit is not None:
+            if time.monotonic() - hit[0] < _SEARCH_CACHE_TTL:
+                _SEARCH_CACHE.move_to_end(cache_key)
+                return list(hit[1])
+            del _SEARCH_CACHE[cache_key]
+    if not _SEARCH_SLOTS.acquire(timeout=0.1):
+        raise _PoolSaturated("search pool saturated, try again shortly")
+    key = getattr(fn, "__name__", repr(fn))
+    timeout = _adaptive_timeout(key)
+    t0 = time.monotonic()
+    try:
+        future = _SEARCH_POOL.submit(fn, *args, **kwargs)
+    except BaseException:
+        _SEARCH_SLOTS.release()
+        raise
+    future.add_done_callback(lambda _: _SEARCH_SLOTS.release())
+    try:
+        results = future.result(timeout=timeout)
+    except FutureTimeout:
+        future.cancel()
+        # Count the timeout as a sample so the estimate can grow again
+        # when the provider has genuinely become slower.
+        _record_latency(key, timeout)
+        return None
+    now = time.monotonic()
+    _record_latency(key, now - t0)
+    if results:
+        with _SEARCH_CACHE_LOCK:
+            _SEARCH_CACHE[cache_key] = (now, list(results))
+            _SEARCH_CACHE.move_to_end(cache_key)
+            while len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+                _SEARCH_CACHE.popitem(last=False)
+    return results
+
+
+def _search_timeout(tool_name: str) -> ToolResult:
+    return ToolResult(
+        False, "Search timed out", tool_name, error_detail="timeout",
+    )
+
+
 def tool_web_search_tool(query: str) -> ToolResult:
     """Search the web via DuckDuckGo."""
-    results = web_search(query, max_results=5)
+    results = _run_search_with_timeout(web_search, query, max_results=5)
+    if results is None:
+        return _search_timeout("web_search")
     formatted = format_search_results(results)
     if not formatted:
         return ToolResult(
@@ -148,7 +499,9 @@ def tool_web_search_tool(query: str) -> ToolResult:
 
 def tool_web_search_news_tool(query: str) -> ToolResult:
     """Search recent news via DuckDuckGo."""
-    results = web_search_news(query, max_results=5)
+    results = _run_search_with_timeout(web_search_news, query, max_results=5)
+    if results is None:
+        return _search_timeout("web_search_news")
     formatted = format_search_results(results)
     if not formatted:
         return ToolResult(
@@ -160,9 +513,11 @@ def tool_web_search_news_tool(query: str) -> ToolResult:
 
 def tool_github_search(query: str) -> ToolResult:
     """Search GitHub repositories and issues."""
-    repos = github_search(query, max_results=3)
-    issues = github_search_issues(query, max_results=3)
-    combined = repos + issues
+    repos = _run_search_with_timeout(github_search, query, max_results=3)
+    issues = _run_search_with_timeout(github_search_issues, query, max_results=3)
+    if repos is None and issues is None:
+        return _search_timeout("github_search")
+    combined = (repos or []) + (issues or [])
     formatted = format_search_results(combined)
     if not formatted:
         return ToolResult(
@@ -174,7 +529,9 @@ def tool_github_search(query: str) -> ToolResult:
 
 def tool_stackoverflow_search(query: str) -> ToolResult:
     """Search Stack Overflow for Q&A."""
-    results = stackoverflow_search(query, max_results=5)
+    results = _run_search_with_timeout(stackoverflow_search, query, max_results=5)
+    if results is None:
+        return _search_timeout("stackoverflow_search")
     formatted = format_search_results(results)
     if not formatted:
         return ToolResult(
@@ -186,7 +543,9 @@ def tool_stackoverflow_search(query: str) -> ToolResult:
 
 def tool_docs_search(query: str) -> ToolResult:
     """Search trusted documentation sites."""
-    results = docs_search(query, max_results=5)
+    results = _run_search_with_timeout(docs_search, query, max_results=5)
+    if results is None:
+        return _search_timeout("docs_search")
     formatted = format_search_results(results)
     if not formatted:
         return ToolResult(
@@ -196,22 +555,65 @@ def tool_docs_search(query: str) -> ToolResult:
     return ToolResult(True, formatted, "docs_search")
 
 
+_FORBIDDEN_EVAL_NAMES = frozenset({
+    "eval", "exec", "compile", "open", "input", "breakpoint",
+    "globals", "locals", "vars", "getattr", "setattr", "delattr",
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _validate_eval(code: str) -> str | None:
+    """Return why *code* is rejected, or None if it may be evaluated.
+
+    The restricted ``__builtins__`` alone can be escaped through dunder
+    attributes (``().__class__.__base__...``), so those are refused at
+    the AST level along with introspection / IO builtins.  The check
+    must see parsed identifiers, not raw source: Python NFKC-normalises
+    names, so ``_`` + U+FE33 + ``class`` ... is ``__class__`` once parsed.
+    """
+    try:
+        tree = ast.parse(code, mode="eval")
+    except SyntaxError:
+        return None  # compile() reports it with the usual message
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and node.attr.startswith("__"):
+            return f"access to '{node.attr}' is not allowed"
+        if isinstance(node, ast.Name) and (
+            node.id in _FORBIDDEN_EVAL_NAMES or node.id.startswith("__")
+        ):
+            return f"use of '{node.id}' is not allowed"
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_eval(code: str):
+    return compile(code, "<python_eval>", "eval")
+
+
+_EVAL_BUILTINS = {
+    "abs": abs, "all": all, "any": any, "bin": bin, "bool": bool,
+    "chr": chr, "dict": dict, "enumerate": enumerate, "float": float,
+    "hex": hex, "int": int, "len": len, "list": list, "map": map,
+    "max": max, "min": min, "oct": oct, "ord": ord, "pow": pow,
+    "range": range, "repr": repr, "reversed": reversed, "round": round,
+    "set": set, "sorted": sorted, "str": str, "sum": sum, "tuple": tuple,
+    "type": type, "zip": zip,
+}
+# Copied per call so names bound by one evaluation (e.g. walrus targets)
+# never leak into the next.
+_EVAL_NAMESPACE = {"__builtins__": _EVAL_BUILTINS, "math": math}
+
+
 def tool_python_eval(code: str) -> ToolResult:
     """Evaluate a Python expression in a restricted namespace."""
+    reason = _validate_eval(code)
+    if reason:
+        return ToolResult(
+            False, f"Error: {reason}", "python_eval", error_detail="forbidden",
+        )
     try:
-        import math
-
-        allowed_builtins = {
-            "abs": abs, "all": all, "any": any, "bin": bin, "bool": bool,
-            "chr": chr, "dict": dict, "enumerate": enumerate, "float": float,
-            "hex": hex, "int": int, "len": len, "list": list, "map": map,
-            "max": max, "min": min, "oct": oct, "ord": ord, "pow": pow,
-            "range": range, "repr": repr, "reversed": reversed, "round": round,
-            "set": set, "sorted": sorted, "str": str, "sum": sum, "tuple": tuple,
-            "type": type, "zip": zip,
-        }
-        namespace = {"__builtins__": allowed_builtins, "math": math}
-        result = eval(code, namespace)
+        namespace = _EVAL_NAMESPACE.copy()
+        result = eval(_compile_eval(code), namespace)
         return ToolResult(True, str(result), "python_eval")
     except Exception as e:
         return ToolResult(
@@ -243,6 +645,7 @@ TOOL_REGISTRY: dict[str, Tool] = {
         description="Read the contents of a file.",
         parameters={"path": "Absolute or relative path to the file"},
         function=tool_read_file,
+        cache_ttl=30.0,
     ),
     "write_file": Tool(
         name="write_file",
@@ -259,8 +662,12 @@ TOOL_REGISTRY: dict[str, Tool] = {
     "list_dir": Tool(
         name="list_dir",
         description="List files and directories at a given path.",
-        parameters={"path": "(optional) Directory path, defaults to '.'"},
+        parameters={
+            "path": "(optional) Directory path, defaults to '.'",
+            "sort": "(optional) Sort entries by name, default true",
+        },
         function=tool_list_dir,
+        cache_ttl=30.0,
     ),
     "web_search": Tool(
         name="web_search",
@@ -286,6 +693,7 @@ TOOL_REGISTRY: dict[str, Tool] = {
         ),
         parameters={"code": "Python expression to evaluate"},
         function=tool_python_eval,
+        cache_ttl=600.0,
     ),
     "github_search": Tool(
         name="github_search",
@@ -351,83 +759,480 @@ def execute_tool(name: str, args: dict) -> ToolResult:
     except Exception as e:
         return ToolResult(
             False, f"Tool {name} error: {e}", name,
-            error_detail=type(e).__name__,
+            error_detail=getattr(e, "error_detail", type(e).__name__),
+        )
+
+
+# Retry/fallback chatter is capped: during an outage every in-flight call
+# retries at once, and unthrottled warnings would flood the job's progress
+# stream.  Records beyond _LOG_RATE_LIMIT per second are dropped.
+_LOG_RATE_LIMIT = 20
+
+
+class _RateLimitFilter(logging.Filter):
+    """Pass at most *limit* records per sliding one-second window."""
+
+    def __init__(self, limit: int = _LOG_RATE_LIMIT):
+        super().__init__()
+        self._stamps: deque[float] = deque(maxlen=limit)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            stamps = self._stamps
+            if len(stamps) == stamps.maxlen and now - stamps[0] < 1.0:
+                return False
+            stamps.append(now)
+        return True
+
+
+logger.addFilter(_RateLimitFilter())
+
+
+# Circuit breaker for network-backed tools: when most calls in the recent
+# window failed, the tool is skipped (straight to its fallbacks) except for
+# one probe call per _CIRCUIT_PROBE_INTERVAL, which can close it again.
+_CIRCUIT_WINDOW = 60.0  # seconds of history considered
+_CIRCUIT_MIN_CALLS = 3
+_CIRCUIT_PROBE_INTERVAL = 30.0
+_CIRCUIT: dict[str, deque[tuple[float, bool]]] = {}
+_CIRCUIT_PROBES: dict[str, float] = {}
+_CIRCUIT_LOCK = threading.Lock()
+
+
+def _record_outcome(name: str, success: bool) -> None:
+    if name not in _SEARCH_TOOLS:
+        return
+    with _CIRCUIT_LOCK:
+        calls = _CIRCUIT.setdefault(name, deque(maxlen=50))
+        calls.append((time.monotonic(), success))
+
+
+def _circuit_tripped(name: str, now: float) -> bool:
+    """True if most recent calls to *name* failed.  Caller holds the lock."""
+    calls = _CIRCUIT.get(name)
+    if not calls:
+        return False
+    while calls and now - calls[0][0] > _CIRCUIT_WINDOW:
+        calls.popleft()
+    if len(calls) < _CIRCUIT_MIN_CALLS:
+        return False
+    failures = sum(1 for _, ok in calls if not ok)
+    return failures * 2 > len(calls)
+
+
+def _circuit_open(name: str) -> bool:
+    """True if *name* should be skipped because it keeps failing.
+
+    A pure check: a tripped circuit whose half-open probe is due reads
+    as closed, but the probe is only spent by :func:`_reserve_probe`.
+    """
+    if name not in _SEARCH_TOOLS:
+        return False
+    now = time.monotonic()
+    with _CIRCUIT_LOCK:
+        return (
+            _circuit_tripped(name, now)
+            and now - _CIRCUIT_PROBES.get(name, 0.0) < _CIRCUIT_PROBE_INTERVAL
         )
 
 
+def _reserve_probe(name: str) -> bool:
+    """Claim a call to *name* immediately before running it.
+
+    Returns False if the circuit is open.  When it is tripped but a probe
+    is due, the probe is marked spent so concurrent callers are refused.
+    """
+    if name not in _SEARCH_TOOLS:
+        return True
+    now = time.monotonic()
+    with _CIRCUIT_LOCK:
+        if not _circuit_tripped(name, now):
+            return True
+        if now - _CIRCUIT_PROBES.get(name, 0.0) >= _CIRCUIT_PROBE_INTERVAL:
+            _CIRCUIT_PROBES[name] = now  # half-open: let this call through
+            return True
+        return False
+
+
+# A search that has neither succeeded nor failed after this long is hedged:
+# its next fallback is started alongside it and the first success wins.
+_HEDGE_DELAY = 3.0  # seconds
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+atexit.register(_HEDGE_POOL.shutdown, wait=False)
+
+
+# Successful results of tools with a ``cache_ttl`` are reused for identical
+# calls.  Search tools have none: providers are already cached per query
+# in _SEARCH_CACHE.  Any tool outside _READ_ONLY_TOOLS may change what a
+# cached read would return, so calling one empties the cache.  That
+# includes every ``shell`` call: a command line cannot be reliably told
+# apart as read-only (``sed -i``, redirections, scripts), and a stale
+# read_file after a shell edit would be worse than a cache miss.
+_RESULT_CACHE_SIZE = 256
+_RESULT_CACHE: OrderedDict[tuple, tuple[float, ToolResult]] = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def clear_result_cache() -> None:
+    """Drop all cached tool results."""
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+
+
+def _cached_result(key: tuple, ttl: float) -> ToolResult | None:
+    with _RESULT_CACHE_LOCK:
+        hit = _RESULT_CACHE.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] >= ttl:
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return replace(hit[1], duration_ms=0.0, backoff_ms_total=0.0)
+
+
+def _store_result(key: tuple, result: ToolResult) -> None:
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic(), replace(result))
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _elapsed_ms(t0: float) -> float:
+    return (time.monotonic() - t0) * 1000.0
+
+
 def execute_tool_with_retry(name: str, args: dict) -> ToolResult:
     """Execute a tool with per-tool retry logic and fallback chain.
 
     1. Retry the primary tool up to tool.max_retries times
     2. If all retries fail, try each fallback tool in order
     3. Return the first successful result, or the last failure
+
+    Search tools are read-only, so their fallbacks are hedged instead of
+    strictly sequential (see ``_execute_hedged``).  Successful results of
+    tools with a ``cache_ttl`` are served from ``_RESULT_CACHE``.
     """
     tool = TOOL_REGISTRY.get(name)
     if not tool:
         return ToolResult(False, f"Unknown tool: {name}", name, error_detail="unknown_tool")
 
+    if name not in _READ_ONLY_TOOLS:
+        clear_result_cache()
+        return _execute_with_retry(tool, name, args)
+    if tool.cache_ttl <= 0:
+        return _execute_with_retry(tool, name, args)
+    key = (name, tuple(sorted(args.items())))
+    try:
+        cached = _cached_result(key, tool.cache_ttl)
+    except TypeError:  # unhashable argument values
+        return _execute_with_retry(tool, name, args)
+    if cached is not None:
+        return cached
+    result = _execute_with_retry(tool, name, args)
+    if result.success:
+        _store_result(key, result)
+    return result
+
+
+# Per-call metrics for the last _METRICS_SIZE executed calls (cache hits are
+# not executions and are not recorded), kept column-wise in typed arrays so
+# the ring buffer costs a few bytes per call rather than an object each.
+_METRICS_SIZE = 4096
+
+
+class _ToolMetrics:
+    __slots__ = ("names", "durations", "retries", "failed", "count", "lock")
+
+    def __init__(self, size: int = _METRICS_SIZE):
+        self.names: list[str] = [""] * size
+        self.durations = array("f", bytes(4 * size))  # ms
+        self.retries = array("B", bytes(size))
+        self.failed = array("B", bytes(size))
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def record(self, name: str, result: ToolResult) -> None:
+        with self.lock:
+            i = self.count % len(self.names)
+            self.names[i] = name
+            self.durations[i] = result.duration_ms
+            self.retries[i] = min(result.retries_used, 255)
+            self.failed[i] = not result.success
+            self.count += 1
+
+
+_METRICS = _ToolMetrics()
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def tool_stats() -> dict[str, dict]:
+    """Summarise recent tool executions per tool.
+
+    Each entry has ``calls``, ``failures``, ``retries`` and the
+    ``p50_ms`` / ``p95_ms`` / ``max_ms`` durations over the most recent
+    ``_METRICS_SIZE`` calls.
+    """
+    m = _METRICS
+    with m.lock:
+        n = min(m.count, len(m.names))
+        rows = list(zip(m.names[:n], m.durations[:n], m.retries[:n], m.failed[:n]))
+    by_tool: dict[str, list] = {}
+    for name, dur, retries, failed in rows:
+        by_tool.setdefault(name, []).append((dur, retries, failed))
+
+    stats = {}
+    for name, calls in by_tool.items():
+        ordered = sorted(c[0] for c in calls)
+        stats[name] = {
+            "calls": len(calls),
+            "failures": sum(c[2] for c in calls),
+            "retries": sum(c[1] for c in calls),
+            "p50_ms": _percentile(ordered, 0.5),
+            "p95_ms": _percentile(ordered, 0.95),
+            "max_ms": ordered[-1],
+        }
+    return stats
+
+
+def _execute_with_retry(tool: Tool, name: str, args: dict) -> ToolResult:
+    result = _execute_resilient(tool, name, args)
+    _METRICS.record(name, result)
+    return result
+
+
+def _execute_resilient(tool: Tool, name: str, args: dict) -> ToolResult:
     t0 = time.monotonic()
+    if not _reserve_probe(name):
+        logger.warning(
+            "[tool] %s is failing repeatedly, skipping to fallbacks...", name,
+        )
+        last_result = ToolResult(
+            False, f"Tool {name} skipped: too many recent failures", name,
+            error_detail="circuit_open",
+        )
+    elif name in _SEARCH_TOOLS and TOOL_FALLBACKS.get(name):
+        return _execute_hedged(tool, name, args, t0)
+    else:
+        last_result = _run_with_retries(tool, name, args, t0)
+        if last_result.success or last_result.error_detail == "bad_args":
+            return last_result
+
+    for fb_name, fb_tool, fb_args in _fallback_calls(name, args):
+        result = _run_fallback(name, fb_name, fb_tool, fb_args, t0)
+        if result is not None and result.success:
+            return result
+
+    last_result.duration_ms = _elapsed_ms(t0)
+    return last_result
+
+
+def _backoff_delay(tool: Tool, attempt: int) -> float:
+    """Exponential backoff from ``tool.retry_delay``, capped and jittered ±50%.
+
+    Jitter keeps concurrent agents from retrying a struggling upstream in
+    lockstep.
+    """
+    base = min(tool.max_retry_delay, tool.retry_delay * 2 ** (attempt - 1))
+    return base * random.uniform(0.5, 1.5)
+
+
+def _single_attempt(tool: Tool, name: str, args: dict, t0: float) -> ToolResult:
+    """Run a ``max_retries == 1`` tool once, without the retry bookkeeping."""
+    try:
+        result = tool.function(**args)
+    except TypeError as e:
+        return ToolResult(
+            False, f"Invalid arguments for {name}: {e}", name,
+            error_detail="bad_args",
+            duration_ms=_elapsed_ms(t0),
+        )
+    except Exception as e:
+        result = ToolResult(
+            False, f"Tool {name} error: {e}", name,
+            error_detail=getattr(e, "error_detail", type(e).__name__),
+            retries_used=1,
+        )
+    result.duration_ms = _elapsed_ms(t0)
+    if result.error_detail not in _FINAL_FAILURES:
+        _record_outcome(name, result.success)
+    return result
+
+
+# Deterministic failures: running the call again repeats its side effects
+# without changing the outcome, and they say nothing about the tool's
+# health, so they are neither retried nor counted by the circuit breaker.
+_FINAL_FAILURES = frozenset({"truncated"})
+
+
+def _run_with_retries(tool: Tool, name: str, args: dict, t0: float) -> ToolResult:
+    """Run *tool* up to ``tool.max_retries`` times; return the first success or last failure."""
+    if tool.max_retries == 1:
+        return _single_attempt(tool, name, args, t0)
     last_result: ToolResult | None = None
+    backoff_total = 0.0
 
     for attempt in range(1, tool.max_retries + 1):
         try:
             result = tool.function(**args)
             result.retries_used = attempt - 1
-            result.duration_ms = (time.monotonic() - t0) * 1000
+            result.duration_ms = _elapsed_ms(t0)
+            result.backoff_ms_total = backoff_total * 1000
             if result.success:
+                _record_outcome(name, True)
+                return result
+            if result.error_detail in _FINAL_FAILURES:
                 return result
             last_result = result
         except TypeError as e:
             return ToolResult(
                 False, f"Invalid arguments for {name}: {e}", name,
                 error_detail="bad_args",
-                duration_ms=(time.monotonic() - t0) * 1000,
+                duration_ms=_elapsed_ms(t0),
             )
         except Exception as e:
             last_result = ToolResult(
                 False, f"Tool {name} error: {e}", name,
-                error_detail=type(e).__name__,
+                error_detail=getattr(e, "error_detail", type(e).__name__),
                 retries_used=attempt,
-                duration_ms=(time.monotonic() - t0) * 1000,
+                duration_ms=_elapsed_ms(t0),
+                backoff_ms_total=backoff_total * 1000,
             )
 
         if attempt < tool.max_retries:
-            print(
-                f"[tool] {name} attempt {attempt} failed, "
-                f"retrying in {tool.retry_delay}s...",
-                file=sys.stderr,
+            delay = _backoff_delay(tool, attempt)
+            logger.warning(
+                "[tool] %s attempt %d failed, retrying in %.1fs...",
+                name, attempt, delay,
             )
-            time.sleep(tool.retry_delay)
+            time.sleep(delay)
+            backoff_total += delay
+
+    _record_outcome(name, False)
+    if last_result is None:
+        return ToolResult(
+            False, f"Tool {name} exhausted all retries and fallbacks", name,
+            duration_ms=_elapsed_ms(t0),
+            error_detail="all_retries_exhausted",
+        )
+    return last_result
+
 
-    fallbacks = TOOL_FALLBACKS.get(name, [])
-    for fb_name in fallbacks:
+def _fallback_calls(name: str, args: dict) -> list[tuple[str, Tool, dict]]:
+    """Return ``(fallback_name, tool, adapted_args)`` for each usable fallback."""
+    calls = []
+    for fb_name in TOOL_FALLBACKS.get(name, []):
         fb_tool = TOOL_REGISTRY.get(fb_name)
-        if not fb_tool:
+        if not fb_tool or _circuit_open(fb_name):
             continue
         fb_args = _adapt_args_for_fallback(name, fb_name, args)
         if fb_args is None:
             continue
-        print(
-            f"[tool] {name} failed, trying fallback '{fb_name}'...",
-            file=sys.stderr,
-        )
-        try:
-            result = fb_tool.function(**fb_args)
-            result.duration_ms = (time.monotonic() - t0) * 1000
-            result.tool_name = f"{name}>{fb_name}"
+        calls.append((fb_name, fb_tool, fb_args))
+    return calls
+
+
+def _run_fallback(
+    name: str, fb_name: str, fb_tool: Tool, fb_args: dict, t0: float,
+) -> ToolResult | None:
+    """Single attempt of a fallback tool.
+
+    Returns None if it raised, or if its circuit opened after
+    :func:`_fallback_calls` listed it.
+    """
+    if not _reserve_probe(fb_name):
+        return None
+    logger.warning("[tool] %s failed, trying fallback '%s'...", name, fb_name)
+    try:
+        result = fb_tool.function(**fb_args)
+    except Exception:
+        _record_outcome(fb_name, False)
+        return None
+    _record_outcome(fb_name, result.success)
+    result.duration_ms = _elapsed_ms(t0)
+    result.tool_name = f"{name}>{fb_name}"
+    return result
+
+
+def _execute_hedged(tool: Tool, name: str, args: dict, t0: float) -> ToolResult:
+    """Run a search tool, hedging with its fallbacks when it is slow or failing.
+
+    The primary (with its retries) starts first.  Whenever a candidate
+    fails, or ``_HEDGE_DELAY`` passes without any result, the next
+    fallback is launched alongside the ones still running.  The first
+    successful result is returned; otherwise the primary's failure.
+    """
+    remaining = _fallback_calls(name, args)
+    primary = _HEDGE_POOL.submit(_run_with_retries, tool, name, args, t0)
+    pending = {primary}
+
+    while pending:
+        done, pending = wait(pending, timeout=_HEDGE_DELAY, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if result is None:
+                continue
             if result.success:
+                for other in pending:
+                    other.cancel()
                 return result
-        except Exception:
-            continue
+            if future is primary and result.error_detail == "bad_args":
+                return result
+        if remaining:
+            fb_name, fb_tool, fb_args = remaining.pop(0)
+            pending.add(_HEDGE_POOL.submit(
+                _run_fallback, name, fb_name, fb_tool, fb_args, t0,
+            ))
 
-    if last_result:
-        last_result.duration_ms = (time.monotonic() - t0) * 1000
-        return last_result
-    return ToolResult(
-        False, f"Tool {name} exhausted all retries and fallbacks", name,
-        duration_ms=(time.monotonic() - t0) * 1000,
-        error_detail="all_retries_exhausted",
-    )
+    result = primary.result()
+    result.duration_ms = _elapsed_ms(t0)
+    return result
+
+
+_BATCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-batch")
+atexit.register(_BATCH_POOL.shutdown, wait=False)
+
+
+def execute_tool_batch(
+    calls: list[tuple[str, dict]], parallelism: int = 8,
+) -> list[ToolResult]:
+    """Execute several ``(name, args)`` tool calls; results are in input order.
+
+    Consecutive read-only calls (searches, file reads, ``python_eval``)
+    run concurrently, at most *parallelism* at a time.  Any other call is
+    a barrier that runs on its own, so writes land in the given order and
+    reads listed after a write observe it.
+    """
+    results: list[ToolResult | None] = [None] * len(calls)
+    run: list[int] = []
+
+    def _flush() -> None:
+        if len(run) == 1:
+            results[run[0]] = execute_tool_with_retry(*calls[run[0]])
+        else:
+            for start in range(0, len(run), parallelism):
+                futures = [
+                    (i, _BATCH_POOL.submit(execute_tool_with_retry, *calls[i]))
+                    for i in run[start:start + parallelism]
+                ]
+                for i, future in futures:
+                    results[i] = future.result()
+        run.clear()
+
+    for i, (name, args) in enumerate(calls):
+        if name in _READ_ONLY_TOOLS:
+            run.append(i)
+        else:
+            _flush()
+            results[i] = execute_tool_with_retry(name, args)
+    _flush()
+    return results
 
 
 _SEARCH_TOOLS = frozenset({
@@ -435,24 +1240,60 @@ _SEARCH_TOOLS = frozenset({
     "stackoverflow_search", "docs_search",
 })
 
+# Tools without side effects; consecutive calls to these may overlap.
+_READ_ONLY_TOOLS = _SEARCH_TOOLS | {"read_file", "list_dir", "python_eval"}
+
+
+def _search_query_args(args: dict) -> dict | None:
+    return {"query": args.get("query", "")}
+
+
+def _read_file_as_shell_args(args: dict) -> dict | None:
+    path = args.get("path", "")
+    return {"command": f"cat {path}"} if path else None
+
+
+# Argument translators keyed by (origin kind, fallback kind), where a tool's
+# kind is "search" for any search tool and its own name otherwise.
+_ADAPTERS: dict[tuple[str, str], Callable[[dict], dict | None]] = {
+    ("search", "search"): _search_query_args,
+    ("read_file", "shell"): _read_file_as_shell_args,
+}
+
+
+def _tool_kind(name: str) -> str:
+    return "search" if name in _SEARCH_TOOLS else name
+
 
 def _adapt_args_for_fallback(
     original: str, fallback: str, args: dict,
 ) -> dict | None:
     """Translate arguments from the original tool to the fallback tool."""
-    if original in _SEARCH_TOOLS and fallback in _SEARCH_TOOLS:
-        return {"query": args.get("query", "")}
-    if original == "read_file" and fallback == "shell":
-        path = args.get("path", "")
-        return {"command": f"cat {path}"} if path else None
-    return None
+    adapter = _ADAPTERS.get((_tool_kind(original), _tool_kind(fallback)))
+    return adapter(args) if adapter else None
+
+
+_TOOL_DESC_CACHE: str | None = None
 
 
 def format_tool_descriptions() -> str:
-    """Format all available tools into a description block for the LLM."""
+    """Format all available tools into a description block for the LLM.
+
+    The registry is static, so the block is built once and reused; call
+    ``_invalidate_tool_descriptions()`` after mutating ``TOOL_REGISTRY``.
+    """
+    global _TOOL_DESC_CACHE
+    if _TOOL_DESC_CACHE is not None:
+        return _TOOL_DESC_CACHE
     lines = []
     for name, tool in TOOL_REGISTRY.items():
         params = ", ".join(f"{k}: {v}" for k, v in tool.parameters.items())
         lines.append(f"- {name}: {tool.description}")
         lines.append(f"  Parameters: {params}")
-    return "\n".join(lines)
+    _TOOL_DESC_CACHE = "\n".join(lines)
+    return _TOOL_DESC_CACHE
+
+
+def _invalidate_tool_descriptions() -> None:
+    global _TOOL_DESC_CACHE
+    _TOOL_DESC_CACHE = None
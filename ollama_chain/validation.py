@@ -24,8 +24,8 @@ def validate_step(
     if not step.get("description"):
         warnings.append(f"Step {step_id} has no description")
 
-    deps = step.get("depends_on", [])
-    if not isinstance(deps, list):
+    deps = step.get("depends_on", ())
+    if not isinstance(deps, (list, tuple)):
         warnings.append(f"Step {step_id} depends_on is not a list")
     elif completed_steps is not None:
         unmet = [d for d in deps if d not in completed_steps]
@@ -40,22 +40,24 @@ def validate_step(
 def validate_plan(plan: list[dict]) -> list[str]:
     """Validate an entire plan.  Returns a list of all warnings."""
     warnings: list[str] = []
+    warn = warnings.append
     all_ids = {s.get("id") for s in plan}
     seen_ids: set[int] = set()
 
     for step in plan:
         step_id = step.get("id")
         if step_id in seen_ids:
-            warnings.append(f"Duplicate step id: {step_id}")
+            warn(f"Duplicate step id: {step_id}")
         seen_ids.add(step_id)
 
         warnings.extend(validate_step(step))
 
-        for dep in step.get("depends_on", []):
+        deps = step.get("depends_on", ())
+        if not isinstance(deps, (list, tuple)):
+            continue  # already reported by validate_step
+        for dep in deps:
             if dep not in all_ids:
-                warnings.append(
-                    f"Step {step_id} depends on non-existent step {dep}"
-                )
+                warn(f"Step {step_id} depends on non-existent step {dep}")
 
     return warnings
 
@@ -68,11 +70,13 @@ def validate_and_fix_plan(plan: list[dict]) -> tuple[list[dict], list[str]]:
       - Unknown tool names (replaced with 'none')
       - Missing descriptions (filled with 'Step N')
       - Non-list depends_on (replaced with empty list)
+      - Missing depends_on (set to [])
       - Missing status (set to 'pending')
 
     Returns (fixed_plan, warnings) where warnings describe what was fixed.
     """
     warnings: list[str] = []
+    warn = warnings.append
     all_ids = {s.get("id") for s in plan}
 
     for step in plan:
@@ -80,26 +84,22 @@ def validate_and_fix_plan(plan: list[dict]) -> tuple[list[dict], list[str]]:
 
         if not step.get("description"):
             step["description"] = f"Step {step_id}"
-            warnings.append(f"Step {step_id}: added placeholder description")
+            warn(f"Step {step_id}: added placeholder description")
 
         tool = step.get("tool", "none")
         if tool not in VALID_TOOLS:
-            warnings.append(
-                f"Step {step_id}: replaced unknown tool '{tool}' with 'none'"
-            )
+            warn(f"Step {step_id}: replaced unknown tool '{tool}' with 'none'")
             step["tool"] = "none"
 
-        deps = step.get("depends_on", [])
+        deps = step.setdefault("depends_on", [])
         if not isinstance(deps, list):
             step["depends_on"] = []
-            warnings.append(f"Step {step_id}: reset invalid depends_on to []")
+            warn(f"Step {step_id}: reset invalid depends_on to []")
         else:
             dangling = [d for d in deps if d not in all_ids]
             if dangling:
                 step["depends_on"] = [d for d in deps if d in all_ids]
-                warnings.append(
-                    f"Step {step_id}: removed dangling deps {dangling}"
-                )
+                warn(f"Step {step_id}: removed dangling deps {dangling}")
 
         step.setdefault("status", "pending")
 
@@ -109,32 +109,39 @@ def validate_and_fix_plan(plan: list[dict]) -> tuple[list[dict], list[str]]:
 def detect_circular_deps(plan: list[dict]) -> list[tuple[int, int]]:
     """Detect circular dependencies in a plan.
 
-    Returns a list of (step_a, step_b) pairs that form cycles.
+    Returns a list of (step_a, step_b) pairs, one for every dependency edge
+    that closes a cycle; dropping all of them leaves the plan acyclic.  The
+    depth-first search keeps its own stack, so long dependency chains
+    cannot hit the recursion limit.
     """
-    adj: dict[int, set[int]] = {}
+    adj: dict[int, list[int]] = {}
     for step in plan:
-        sid = step.get("id", 0)
-        adj[sid] = set(step.get("depends_on", []))
+        adj[step.get("id", 0)] = list(dict.fromkeys(step.get("depends_on") or ()))
+
+    nodes = list(adj)
+    pos = {sid: i for i, sid in enumerate(nodes)}
+    succ = [[pos[d] for d in adj[sid] if d in pos] for sid in nodes]
+    state = [0] * len(nodes)  # 0 = unvisited, 1 = on current path, 2 = done
 
     cycles: list[tuple[int, int]] = []
-    visited: set[int] = set()
-    path: set[int] = set()
-
-    def _dfs(node: int) -> bool:
-        visited.add(node)
-        path.add(node)
-        for dep in adj.get(node, set()):
-            if dep in path:
-                cycles.append((node, dep))
-                return True
-            if dep not in visited and _dfs(dep):
-                return True
-        path.discard(node)
-        return False
-
-    for sid in adj:
-        if sid not in visited:
-            _dfs(sid)
+    for root in range(len(nodes)):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, 0)]
+        while stack:
+            node, i = stack[-1]
+            if i == len(succ[node]):
+                state[node] = 2
+                stack.pop()
+                continue
+            stack[-1] = (node, i + 1)
+            dep = succ[node][i]
+            if state[dep] == 1:
+                cycles.append((nodes[node], nodes[dep]))
+            elif state[dep] == 0:
+                state[dep] = 1
+                stack.append((dep, 0))
 
     return cycles
 
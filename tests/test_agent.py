@@ -15,48 +15,33 @@ from ollama_chain.memory import SessionMemory
 
 
 class TestParseResponse:
-    def test_tool_call(self):
-        text = '<tool_call>\n{"name": "shell", "args": {"command": "ls"}}\n</tool_call>'
+    @pytest.mark.parametrize("text,expected", [
+        ('<tool_call>\n{"name": "shell", "args": {"command": "ls"}}\n</tool_call>',
+         {"type": "tool_call", "name": "shell", "args": {"command": "ls"}}),
+        ("<final_answer>\nThe answer is 42.\n</final_answer>",
+         {"type": "final_answer"}),
+        ("I think we should search next.", {"type": "reasoning"}),
+        ("<store_fact>\nOS: Fedora\n</store_fact>\n"
+         '<tool_call>\n{"name":"shell","args":{"command":"ls"}}\n</tool_call>',
+         {"type": "tool_call", "facts": ["OS: Fedora"]}),
+        ("<store_fact>\nfact1\n</store_fact>\n"
+         "<store_fact>\nfact2\n</store_fact>\n"
+         "<final_answer>\ndone\n</final_answer>",
+         {"type": "final_answer", "facts": ["fact1", "fact2"]}),
+        ("<tool_call>\nnot json\n</tool_call>", {"type": "malformed_tool_call"}),
+    ], ids=[
+        "tool_call", "final_answer", "reasoning", "store_fact",
+        "multiple_facts", "malformed_tool_call",
+    ])
+    def test_parse(self, text, expected):
         r = _parse_response(text)
-        assert r["type"] == "tool_call"
-        assert r["name"] == "shell"
-        assert r["args"] == {"command": "ls"}
+        for key, value in expected.items():
+            assert r[key] == value, key
 
-    def test_final_answer(self):
-        text = "<final_answer>\nThe answer is 42.\n</final_answer>"
-        r = _parse_response(text)
-        assert r["type"] == "final_answer"
+    def test_final_answer_content(self):
+        r = _parse_response("<final_answer>\nThe answer is 42.\n</final_answer>")
         assert "42" in r["content"]
 
-    def test_reasoning(self):
-        text = "I think we should search next."
-        r = _parse_response(text)
-        assert r["type"] == "reasoning"
-
-    def test_store_fact(self):
-        text = (
-            "<store_fact>\nOS: Fedora\n</store_fact>\n"
-            '<tool_call>\n{"name":"shell","args":{"command":"ls"}}\n</tool_call>'
-        )
-        r = _parse_response(text)
-        assert r["type"] == "tool_call"
-        assert r["facts"] == ["OS: Fedora"]
-
-    def test_multiple_facts(self):
-        text = (
-            "<store_fact>\nfact1\n</store_fact>\n"
-            "<store_fact>\nfact2\n</store_fact>\n"
-            "<final_answer>\ndone\n</final_answer>"
-        )
-        r = _parse_response(text)
-        assert r["type"] == "final_answer"
-        assert len(r["facts"]) == 2
-
-    def test_malformed_tool_call(self):
-        text = "<tool_call>\nnot json\n</tool_call>"
-        r = _parse_response(text)
-        assert r["type"] == "malformed_tool_call"
-
 
 class TestExtractQuotedStrings:
     def test_single_quotes(self):
@@ -81,6 +66,16 @@ class TestExtractQuotedStrings:
     def test_short_strings_ignored(self):
         assert _extract_quoted_strings("Run 'x'") == []
 
+    def test_text_order_and_nesting(self):
+        text = "Run `echo 'hi there'` then \"uname -r\" then 'id -u'"
+        assert _extract_quoted_strings(text) == [
+            "echo 'hi there'", "uname -r", "id -u",
+        ]
+
+    def test_prose_apostrophes_not_openers(self):
+        text = "Don't guess; run `uname -r` and check the system's kernel"
+        assert _extract_quoted_strings(text) == ["uname -r"]
+
     def test_empty(self):
         assert _extract_quoted_strings("no quotes here") == []
 
@@ -98,6 +93,10 @@ class TestIsSafeCommand:
         assert not _is_safe_command("dd if=/dev/zero of=/dev/sda")
         assert not _is_safe_command("chmod -R 777 /")
 
+    def test_dangerous_commands_any_case(self):
+        assert not _is_safe_command("  RM -RF /tmp/x")
+        assert not _is_safe_command("FORMAT C:")
+
 
 class TestBuildSearchQuery:
     def test_strip_prefix(self):
@@ -120,37 +119,48 @@ class TestBuildSearchQuery:
         q = _build_search_query("CVE-2024-1234 details", [])
         assert q == "CVE-2024-1234 details"
 
+    def test_fact_with_backslash_inserted_literally(self):
+        q = _build_search_query(
+            "Search for CVEs for the current OS", [r"OS: Windows C:\\1"],
+        )
+        assert q == r"CVEs for Windows C:\\1"
+
     def test_trailing_dot_stripped(self):
         q = _build_search_query("Search for something.", [])
         assert not q.endswith(".")
 
 
 class TestExtractFacts:
-    def test_os_release(self):
-        output = (
-            'NAME="Fedora Linux"\n'
-            'VERSION="43 (Workstation Edition)"\n'
-            "ID=fedora\n"
-            "VERSION_ID=43\n"
-            'PRETTY_NAME="Fedora Linux 43 (Workstation Edition)"\n'
-        )
+    _OS_RELEASE = (
+        'NAME="Fedora Linux"\n'
+        'VERSION="43 (Workstation Edition)"\n'
+        "ID=fedora\n"
+        "VERSION_ID=43\n"
+        'PRETTY_NAME="Fedora Linux 43 (Workstation Edition)"\n'
+    )
+
+    @pytest.mark.parametrize("output,expected", [
+        (_OS_RELEASE, ("Fedora", "43", "fedora")),
+        ("Linux framework 6.18.12-200.fc43.x86_64 #1 SMP x86_64 GNU/Linux",
+         ("6.18.12",)),
+    ], ids=["os_release", "kernel_version"])
+    def test_shell_facts(self, output, expected):
+        blob = "\n".join(_extract_facts_from_output("shell", output))
+        for needle in expected:
+            assert needle in blob, needle
+
+    @pytest.mark.parametrize("tool_name,output", [
+        ("web_search", "PRETTY_NAME=Ubuntu"),
+        ("shell", "just some random output"),
+        ("list_dir", ""),
+    ], ids=["non_shell_ignored", "no_match", "list_dir_empty"])
+    def test_no_facts(self, tool_name, output):
+        assert _extract_facts_from_output(tool_name, output) == []
+
+    def test_os_release_read_twice_deduplicated(self):
+        output = 'ID=fedora\r\nID_LIKE="rhel"\n  VERSION_ID=43 \n' * 2
         facts = _extract_facts_from_output("shell", output)
-        assert any("Fedora" in f for f in facts)
-        assert any("43" in f for f in facts)
-        assert any("fedora" in f for f in facts)
-
-    def test_kernel_version(self):
-        output = "Linux framework 6.18.12-200.fc43.x86_64 #1 SMP x86_64 GNU/Linux"
-        facts = _extract_facts_from_output("shell", output)
-        assert any("6.18.12" in f for f in facts)
-
-    def test_non_shell_ignored(self):
-        facts = _extract_facts_from_output("web_search", "PRETTY_NAME=Ubuntu")
-        assert facts == []
-
-    def test_no_match(self):
-        facts = _extract_facts_from_output("shell", "just some random output")
-        assert facts == []
+        assert facts == ["OS ID: fedora", "OS Version ID: 43"]
 
     def test_combined(self):
         output = (
@@ -169,10 +179,10 @@ class TestExtractFacts:
 
     def test_list_dir(self):
         output = ".git\n.gitignore\nMakefile\nREADME.md\nollama_chain\npyproject.toml\nrequirements.txt\ntests"
-        facts = _extract_facts_from_output("list_dir", output)
-        assert any("Directory contents" in f for f in facts)
-        assert any("Makefile" in f for f in facts)
-        assert any("pyproject.toml" in f for f in facts)
+        blob = "\n".join(_extract_facts_from_output("list_dir", output))
+        assert "Directory contents" in blob
+        assert "Makefile" in blob
+        assert "pyproject.toml" in blob
 
     def test_list_dir_with_py_files(self):
         output = "__init__.py\ncli.py\nagent.py\nchains.py"
@@ -182,10 +192,6 @@ class TestExtractFacts:
         assert "cli.py" in py_facts[0]
         assert "agent.py" in py_facts[0]
 
-    def test_list_dir_empty(self):
-        facts = _extract_facts_from_output("list_dir", "")
-        assert facts == []
-
 
 # ---------------------------------------------------------------------------
 # Pre-execution validation
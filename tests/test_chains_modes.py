@@ -1,13 +1,15 @@
 """Unit tests for all chain modes — mocked LLM calls, no Ollama required."""
 
-from unittest.mock import patch, call
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
 from ollama_chain.chains import (
+    CHAINS,
     CLI_ONLY_MODES,
     _enrich_with_search,
     _inject_search_context,
+    chain_auto,
     chain_cascade,
     chain_consensus,
     chain_fast,
@@ -17,10 +19,36 @@ from ollama_chain.chains import (
     chain_strong,
     chain_verify,
 )
+from ollama_chain.router import RouteDecision
 
 
 MODELS = ["small:7b", "medium:14b", "large:32b"]
 
+_EXPECTED_CHAINS = frozenset({
+    "cascade", "auto", "route", "pipeline", "verify",
+    "consensus", "search", "fast", "strong", "agent",
+})
+
+_ROUTE_COMPLEX = RouteDecision(
+    models=MODELS, complexity="complex",
+    strategy="full_cascade", fallback_model="small:7b",
+    skip_search=False, confidence=0.7, reasoning="test",
+)
+_ROUTE_MODERATE = RouteDecision(
+    models=["small:7b", "large:32b"], complexity="moderate",
+    strategy="subset_cascade", fallback_model="small:7b",
+    skip_search=False, confidence=0.6, reasoning="test",
+)
+
+
+@pytest.fixture
+def mock_ask(monkeypatch):
+    """Replace ``chains.ask`` with a MagicMock and turn off search enrichment."""
+    ask = MagicMock()
+    monkeypatch.setattr("ollama_chain.chains.ask", ask)
+    monkeypatch.setattr("ollama_chain.chains._enrich_with_search", lambda *a, **k: "")
+    return ask
+
 
 # ---------------------------------------------------------------------------
 # CLI_ONLY_MODES
@@ -40,6 +68,19 @@ class TestCLIOnlyModes:
         assert "agent" not in CLI_ONLY_MODES
 
 
+# ---------------------------------------------------------------------------
+# CHAINS registry
+# ---------------------------------------------------------------------------
+
+class TestChainRegistry:
+    def test_all_modes_registered(self):
+        diff = _EXPECTED_CHAINS.symmetric_difference(CHAINS)
+        assert not diff, f"CHAINS mismatch: {sorted(diff)}"
+
+    def test_cli_only_modes_not_in_chains(self):
+        assert CLI_ONLY_MODES.isdisjoint(CHAINS)
+
+
 # ---------------------------------------------------------------------------
 # _enrich_with_search / _inject_search_context
 # ---------------------------------------------------------------------------
@@ -74,17 +115,13 @@ class TestSearchHelpers:
 # ---------------------------------------------------------------------------
 
 class TestCascadeComplexity:
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_simple_complexity_no_thinking(self, _s, mock_ask):
+    def test_simple_complexity_no_thinking(self, mock_ask):
         mock_ask.side_effect = ["draft", "reviewed", "final"]
         chain_cascade("q", MODELS, web_search=False, complexity="simple")
         for c in mock_ask.call_args_list:
             assert c.kwargs.get("thinking", False) is False
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_moderate_complexity_final_only_thinking(self, _s, mock_ask):
+    def test_moderate_complexity_final_only_thinking(self, mock_ask):
         mock_ask.side_effect = ["draft", "reviewed", "final"]
         chain_cascade("q", MODELS, web_search=False, complexity="moderate")
         # draft: no thinking, review: no thinking, final: thinking
@@ -93,9 +130,7 @@ class TestCascadeComplexity:
         assert calls[1].kwargs.get("thinking", False) is False  # review
         assert calls[2].kwargs.get("thinking") is True          # final
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_complex_complexity_review_and_final_thinking(self, _s, mock_ask):
+    def test_complex_complexity_review_and_final_thinking(self, mock_ask):
         mock_ask.side_effect = ["draft", "reviewed", "final"]
         chain_cascade("q", MODELS, web_search=False, complexity="complex")
         calls = mock_ask.call_args_list
@@ -103,18 +138,14 @@ class TestCascadeComplexity:
         assert calls[1].kwargs.get("thinking") is True          # review
         assert calls[2].kwargs.get("thinking") is True          # final
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_none_complexity_defaults_to_complex(self, _s, mock_ask):
+    def test_none_complexity_defaults_to_complex(self, mock_ask):
         mock_ask.side_effect = ["draft", "reviewed", "final"]
         chain_cascade("q", MODELS, web_search=False, complexity=None)
         calls = mock_ask.call_args_list
         assert calls[1].kwargs.get("thinking") is True  # review
         assert calls[2].kwargs.get("thinking") is True  # final
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_complex_passes_temperature_for_review(self, _s, mock_ask):
+    def test_complex_passes_temperature_for_review(self, mock_ask):
         mock_ask.side_effect = ["draft", "reviewed", "final"]
         chain_cascade("q", MODELS, web_search=False, complexity="complex")
         calls = mock_ask.call_args_list
@@ -127,17 +158,13 @@ class TestCascadeComplexity:
 # ---------------------------------------------------------------------------
 
 class TestChainRoute:
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_simple_routes_to_fast(self, _s, mock_ask):
+    def test_simple_routes_to_fast(self, mock_ask):
         mock_ask.side_effect = ["2", "fast answer"]
         result = chain_route("simple q", MODELS, web_search=False)
         assert result == "fast answer"
         assert mock_ask.call_count == 2
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_complex_routes_to_strong(self, _s, mock_ask):
+    def test_complex_routes_to_strong(self, mock_ask):
         mock_ask.side_effect = ["5", "strong answer"]
         result = chain_route("complex q", MODELS, web_search=False)
         assert result == "strong answer"
@@ -145,9 +172,7 @@ class TestChainRoute:
         second_call = mock_ask.call_args_list[1]
         assert second_call.kwargs.get("thinking") is True
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_non_numeric_defaults_complex(self, _s, mock_ask):
+    def test_non_numeric_defaults_complex(self, mock_ask):
         mock_ask.side_effect = ["not a number", "strong answer"]
         result = chain_route("q", MODELS, web_search=False)
         assert result == "strong answer"
@@ -158,9 +183,7 @@ class TestChainRoute:
 # ---------------------------------------------------------------------------
 
 class TestChainPipeline:
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_three_stage_pipeline(self, _s, mock_ask):
+    def test_three_stage_pipeline(self, mock_ask):
         mock_ask.side_effect = ["key points", "networking", "deep analysis"]
         result = chain_pipeline("explain TCP", MODELS, web_search=False)
         assert result == "deep analysis"
@@ -174,9 +197,7 @@ class TestChainPipeline:
 # ---------------------------------------------------------------------------
 
 class TestChainVerify:
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_draft_then_verify(self, _s, mock_ask):
+    def test_draft_then_verify(self, mock_ask):
         mock_ask.side_effect = ["draft", "verified"]
         result = chain_verify("q", MODELS, web_search=False)
         assert result == "verified"
@@ -189,10 +210,10 @@ class TestChainVerify:
 # ---------------------------------------------------------------------------
 
 class TestChainConsensus:
-    @patch("ollama_chain.chains.model_supports_thinking", return_value=False)
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_all_models_answer_then_merge(self, _s, mock_ask, _cap):
+    def test_all_models_answer_then_merge(self, mock_ask, monkeypatch):
+        monkeypatch.setattr(
+            "ollama_chain.chains.model_supports_thinking", lambda *a, **k: False,
+        )
         mock_ask.side_effect = ["ans1", "ans2", "ans3", "merged"]
         result = chain_consensus("q", MODELS, web_search=False)
         assert result == "merged"
@@ -204,7 +225,6 @@ class TestChainConsensus:
 # ---------------------------------------------------------------------------
 
 class TestChainSearch:
-    @patch("ollama_chain.chains.ask")
     @patch("ollama_chain.chains.search_for_query", return_value="search results")
     def test_search_with_results(self, _s, mock_ask):
         mock_ask.return_value = "synthesized"
@@ -212,7 +232,6 @@ class TestChainSearch:
         assert result == "synthesized"
         assert mock_ask.call_args.kwargs.get("thinking") is True
 
-    @patch("ollama_chain.chains.ask")
     @patch("ollama_chain.chains.search_for_query", return_value="")
     def test_search_no_results_fallback(self, _s, mock_ask):
         mock_ask.return_value = "fallback answer"
@@ -225,17 +244,13 @@ class TestChainSearch:
 # ---------------------------------------------------------------------------
 
 class TestChainFastStrong:
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_fast_no_thinking(self, _s, mock_ask):
+    def test_fast_no_thinking(self, mock_ask):
         mock_ask.return_value = "fast"
         result = chain_fast("q", MODELS, web_search=False)
         assert result == "fast"
         assert mock_ask.call_args.kwargs.get("thinking", False) is False
 
-    @patch("ollama_chain.chains.ask")
-    @patch("ollama_chain.chains._enrich_with_search", return_value="")
-    def test_strong_with_thinking(self, _s, mock_ask):
+    def test_strong_with_thinking(self, mock_ask):
         mock_ask.return_value = "strong"
         result = chain_strong("q", MODELS, web_search=False)
         assert result == "strong"
@@ -251,14 +266,8 @@ class TestChainAutoComplexity:
     @patch("ollama_chain.chains.route_query")
     @patch("ollama_chain.chains.chain_cascade")
     def test_auto_passes_complexity_to_cascade(self, mock_cascade, mock_route):
-        from ollama_chain.router import RouteDecision
-        mock_route.return_value = RouteDecision(
-            models=MODELS, complexity="complex",
-            strategy="full_cascade", fallback_model="small:7b",
-            skip_search=False, confidence=0.7, reasoning="test",
-        )
+        mock_route.return_value = _ROUTE_COMPLEX
         mock_cascade.return_value = "result"
-        from ollama_chain.chains import chain_auto
         chain_auto("q", MODELS, web_search=True)
         _, kwargs = mock_cascade.call_args
         assert kwargs["complexity"] == "complex"
@@ -266,14 +275,8 @@ class TestChainAutoComplexity:
     @patch("ollama_chain.chains.route_query")
     @patch("ollama_chain.chains.chain_cascade")
     def test_auto_subset_passes_complexity(self, mock_cascade, mock_route):
-        from ollama_chain.router import RouteDecision
-        mock_route.return_value = RouteDecision(
-            models=["small:7b", "large:32b"], complexity="moderate",
-            strategy="subset_cascade", fallback_model="small:7b",
-            skip_search=False, confidence=0.6, reasoning="test",
-        )
+        mock_route.return_value = _ROUTE_MODERATE
         mock_cascade.return_value = "result"
-        from ollama_chain.chains import chain_auto
         chain_auto("q", MODELS, web_search=True)
         _, kwargs = mock_cascade.call_args
         assert kwargs["complexity"] == "moderate"
@@ -2,7 +2,8 @@
 
 import pytest
 
-from ollama_chain.cli import detect_pcap_path
+from ollama_chain.chains import CHAINS
+from ollama_chain.cli import _MODE_CHOICES, _build_parser, detect_pcap_path, main
 
 
 # ---------------------------------------------------------------------------
@@ -35,5 +36,98 @@ class TestDetectPcapPath:
     def test_case_insensitive_extension(self):
         assert detect_pcap_path("file.PCAP") == "file.PCAP"
 
+    def test_cap_word_without_extension(self):
+        assert detect_pcap_path("Capture traffic on eth0") is None
+
+    def test_extension_word_without_dot(self):
+        assert detect_pcap_path("Read the pcap from eth0") is None
+
+    def test_trailing_punctuation_stripped(self):
+        assert detect_pcap_path("Open (trace.CAP), please") == "trace.CAP"
+
     def test_path_with_directories(self):
         assert detect_pcap_path("check /var/log/dump.pcapng for errors") == "/var/log/dump.pcapng"
+
+
+# ---------------------------------------------------------------------------
+# --mode choices
+# ---------------------------------------------------------------------------
+
+class TestModeChoices:
+    def test_matches_chains(self):
+        assert list(_MODE_CHOICES) == list(CHAINS) + ["pcap", "k8s"]
+
+
+# ---------------------------------------------------------------------------
+# Argument parser
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def parser():
+    """One parser for the module; parse_args() does not mutate it."""
+    return _build_parser()
+
+
+class TestBuildParser:
+    def test_defaults(self, parser):
+        args = parser.parse_args(["What", "is", "TCP?"])
+        assert args.query == ["What", "is", "TCP?"]
+        assert args.mode == "cascade"
+        assert args.max_iterations == 15
+        assert args.pcap is None
+        assert not args.no_search
+
+    def test_mode_specific_flags_without_mode(self, parser):
+        args = parser.parse_args(["--pcap", "dump.pcap", "--kubeconfig", "kc"])
+        assert args.pcap == "dump.pcap"
+        assert args.kubeconfig == "kc"
+        assert args.mode == "cascade"
+
+    def test_unknown_mode_rejected(self, parser):
+        with pytest.raises(SystemExit):
+            parser.parse_args(["-m", "nope", "q"])
+
+
+# ---------------------------------------------------------------------------
+# Memory commands
+# ---------------------------------------------------------------------------
+
+class _FakeMemory:
+    cleared = False
+
+    def clear(self):
+        _FakeMemory.cleared = True
+
+    def get_facts(self):
+        return ["OS: Fedora"]
+
+    def get_recent_sessions(self):
+        return [{"session_id": "s1", "goal": "g", "summary": "done"}]
+
+
+class TestMemoryCommands:
+    @pytest.fixture(autouse=True)
+    def no_models(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.cli.PersistentMemory", _FakeMemory)
+        monkeypatch.setattr(_FakeMemory, "cleared", False)
+
+        def fail():
+            raise AssertionError("memory commands must not discover models")
+        monkeypatch.setattr("ollama_chain.cli.discover_models", fail)
+
+    def test_clear_memory_exits(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.argv", ["ollama-chain", "--clear-memory"])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 0
+        assert _FakeMemory.cleared
+        assert "cleared" in capsys.readouterr().out
+
+    def test_show_memory_exits(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.argv", ["ollama-chain", "--show-memory"])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 0
+        out = capsys.readouterr().out
+        assert "OS: Fedora" in out
+        assert "[s1] g" in out
@@ -1,12 +1,15 @@
 """Unit tests for common.py — model capability detection, ask(), retry, helpers."""
 
-from unittest.mock import MagicMock, patch, call
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch, call
 
 import pytest
 
 from ollama_chain.common import (
     _DEFAULT_KEEP_ALIVE,
     _SOURCE_MARKERS,
+    _section_header,
     SOURCE_GUIDANCE,
     _thinking_cache,
     ask,
@@ -31,18 +34,16 @@ class TestModelSupportsThinking:
 
     @patch("ollama_chain.common.ollama_client")
     def test_thinking_model_via_api(self, mock_client):
-        mock_resp = MagicMock()
-        mock_resp.capabilities = ["completion", "tools", "thinking"]
-        mock_client.show.return_value = mock_resp
+        mock_client.show.return_value = SimpleNamespace(
+            capabilities=["completion", "tools", "thinking"],
+        )
 
         assert model_supports_thinking("qwen3:14b") is True
         mock_client.show.assert_called_once_with("qwen3:14b")
 
     @patch("ollama_chain.common.ollama_client")
     def test_non_thinking_model_via_api(self, mock_client):
-        mock_resp = MagicMock()
-        mock_resp.capabilities = ["completion", "tools"]
-        mock_client.show.return_value = mock_resp
+        mock_client.show.return_value = SimpleNamespace(capabilities=["completion", "tools"])
 
         assert model_supports_thinking("mistral-large:123b") is False
 
@@ -63,9 +64,7 @@ class TestModelSupportsThinking:
 
     @patch("ollama_chain.common.ollama_client")
     def test_result_is_cached(self, mock_client):
-        mock_resp = MagicMock()
-        mock_resp.capabilities = ["thinking"]
-        mock_client.show.return_value = mock_resp
+        mock_client.show.return_value = SimpleNamespace(capabilities=["thinking"])
 
         model_supports_thinking("test:1b")
         model_supports_thinking("test:1b")
@@ -73,12 +72,23 @@ class TestModelSupportsThinking:
 
     @patch("ollama_chain.common.ollama_client")
     def test_none_capabilities(self, mock_client):
-        mock_resp = MagicMock()
-        mock_resp.capabilities = None
-        mock_client.show.return_value = mock_resp
+        mock_client.show.return_value = SimpleNamespace(capabilities=None)
 
         assert model_supports_thinking("unknown:7b") is False
 
+    @patch("ollama_chain.common.ollama_client")
+    def test_negative_result_is_cached(self, mock_client):
+        mock_client.show.return_value = SimpleNamespace(capabilities=["completion"])
+
+        assert model_supports_thinking("plain:1b") is False
+        assert model_supports_thinking("plain:1b") is False
+        mock_client.show.assert_called_once()
+
+    @patch("ollama_chain.common.ollama_client")
+    def test_fallback_matches_registry_path(self, mock_client):
+        mock_client.show.side_effect = Exception("fail")
+        assert model_supports_thinking("hf.co/org/Qwen3-8B-GGUF:Q4") is True
+
     @patch("ollama_chain.common.ollama_client")
     def test_qwq_fallback(self, mock_client):
         mock_client.show.side_effect = Exception("fail")
@@ -92,11 +102,14 @@ class TestModelSupportsThinking:
 class TestAsk:
     @patch("ollama_chain.common.model_supports_thinking", return_value=True)
     @patch("ollama_chain.common.chat_with_retry")
-    def test_no_think_prefix_when_thinking_false(self, mock_chat, mock_cap):
+    def test_no_think_system_turn_when_thinking_false(self, mock_chat, mock_cap):
         mock_chat.return_value = {"message": {"content": "answer"}}
         result = ask("question", "qwen3:14b", thinking=False)
-        sent_prompt = mock_chat.call_args[1]["messages"][0]["content"]
-        assert sent_prompt.startswith("/no_think\n")
+        sent = mock_chat.call_args[1]["messages"]
+        assert sent == [
+            {"role": "system", "content": "/no_think"},
+            {"role": "user", "content": "question"},
+        ]
         assert result == "answer"
 
     @patch("ollama_chain.common.model_supports_thinking", return_value=True)
@@ -133,6 +146,15 @@ class TestAsk:
         assert result == "The real answer"
         assert "<think>" not in result
 
+    @patch("ollama_chain.common.model_supports_thinking", return_value=True)
+    @patch("ollama_chain.common.chat_with_retry")
+    def test_strips_multiline_and_repeated_think_blocks(self, mock_chat, mock_cap):
+        mock_chat.return_value = {
+            "message": {"content": "<think>a\nb</think>\nFirst <think>c</think>second"}
+        }
+        result = ask("q", "qwen3:14b", thinking=True)
+        assert result == "First second"
+
     @patch("ollama_chain.common.model_supports_thinking", return_value=True)
     @patch("ollama_chain.common.chat_with_retry")
     def test_temperature_passed_as_options(self, mock_chat, mock_cap):
@@ -190,6 +212,18 @@ class TestChatWithRetry:
             chat_with_retry("model", [{"role": "user", "content": "q"}])
         assert mock_client.chat.call_count == 1
 
+    @pytest.mark.parametrize("err", [
+        TimeoutError("read operation did not complete"),
+        RuntimeError("server returned Unexpected EOF"),
+    ], ids=["exception-type", "message"])
+    @patch("ollama_chain.common.time.sleep")
+    @patch("ollama_chain.common.ollama_client")
+    def test_retryable_by_type_or_message(self, mock_client, mock_sleep, err):
+        mock_client.chat.side_effect = [err, {"message": {"content": "ok"}}]
+        result = chat_with_retry("model", [{"role": "user", "content": "q"}])
+        assert result["message"]["content"] == "ok"
+        mock_sleep.assert_called_once()
+
     @patch("ollama_chain.common.ollama_client")
     def test_all_retries_exhausted(self, mock_client):
         mock_client.chat.side_effect = ConnectionError("connection timeout")
@@ -278,6 +312,22 @@ class TestSanitizeMessages:
         assert "x" in result[0]["content"]
         assert "z" in result[0]["content"]
 
+    def test_merge_keeps_order_separator_and_first_extras(self):
+        msgs = [
+            {"role": "system", "content": "s"},
+            {"role": "user", "content": "a", "images": ["i.png"]},
+            {"role": "user", "content": "b"},
+            {"role": "user", "content": "c"},
+            {"role": "assistant", "content": "d"},
+        ]
+        result = sanitize_messages(msgs)
+        assert result == [
+            {"role": "system", "content": "s"},
+            {"role": "user", "content": "a\n\nb\n\nc", "images": ["i.png"]},
+            {"role": "assistant", "content": "d"},
+        ]
+        assert result[0] is not msgs[0]
+
 
 # ---------------------------------------------------------------------------
 # unload helpers
@@ -304,6 +354,13 @@ class TestUnloadHelpers:
         mock_unload.assert_any_call("b")
         mock_unload.assert_any_call("c")
 
+    def test_unload_all_runs_concurrently(self, monkeypatch):
+        barrier = threading.Barrier(3, timeout=5)
+        monkeypatch.setattr(
+            "ollama_chain.common.unload_model", lambda m: barrier.wait(),
+        )
+        unload_all_models(["a", "b", "c"])  # BrokenBarrierError if serial
+
     @patch("ollama_chain.common.unload_model")
     def test_unload_all_empty(self, mock_unload):
         unload_all_models([])
@@ -319,6 +376,12 @@ class TestPromptFormatting:
         result = format_prompt_section("role", "You are helpful")
         assert result == "=== ROLE ===\nYou are helpful"
 
+    def test_format_prompt_section_caches_header_not_body(self):
+        format_prompt_section("goal", "one")
+        hits = _section_header.cache_info().hits
+        assert format_prompt_section("goal", "two") == "=== GOAL ===\ntwo"
+        assert _section_header.cache_info().hits == hits + 1
+
     def test_build_structured_prompt_basic(self):
         result = build_structured_prompt(
             [("Title", "Body")], instructions="Do it well",
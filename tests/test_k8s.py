@@ -4,7 +4,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from ollama_chain.k8s import K8sAnalysis, _run, format_analysis
+from ollama_chain.k8s import K8sAnalysis, _run, analyze_cluster, format_analysis
 
 
 # ---------------------------------------------------------------------------
@@ -163,7 +163,6 @@ class TestIssueDetection:
             return ""
         mock_run.side_effect = side_effect
 
-        from ollama_chain.k8s import analyze_cluster
         a = analyze_cluster("/kube")
         assert any("Unhealthy pod" in w for w in a.warnings)
 
@@ -182,6 +181,5 @@ class TestIssueDetection:
             return ""
         mock_run.side_effect = side_effect
 
-        from ollama_chain.k8s import analyze_cluster
         a = analyze_cluster("/kube")
         assert any("DEGRADED" in e for e in a.errors)
@@ -14,6 +14,7 @@ from ollama_chain.memory import (
     MemoryEntry,
     PersistentMemory,
     SessionMemory,
+    _MAX_HISTORY_ENTRIES,
 )
 
 
@@ -27,6 +28,9 @@ class TestMemoryEntry:
         assert e.content_type == CONTENT_TEXT
         assert e.tags == []
 
+    def test_slotted(self):
+        assert not hasattr(MemoryEntry(role="user", content="hi"), "__dict__")
+
     def test_custom_content_type(self):
         e = MemoryEntry(
             role="tool", content="output", content_type=CONTENT_TOOL_OUTPUT,
@@ -71,11 +75,41 @@ class TestSessionMemory:
 
     def test_add_fact_dedup(self):
         s = SessionMemory(session_id="t", goal="g")
-        s.add_fact("OS: Fedora 43")
-        s.add_fact("OS: Fedora 43")
+        assert s.add_fact("OS: Fedora 43") is True
+        assert s.add_fact("OS: Fedora 43") is False
         assert len(s.facts) == 1
         assert s.facts[0] == "OS: Fedora 43"
 
+    def test_history_bounded(self):
+        s = SessionMemory(session_id="t", goal="g")
+        for i in range(_MAX_HISTORY_ENTRIES + 50):
+            s.add("user", f"m{i}")
+        assert len(s.history) == _MAX_HISTORY_ENTRIES
+        assert s.history[0].content == "m50"
+        assert [e.content for e in s.recent_history(2)] == [
+            f"m{_MAX_HISTORY_ENTRIES + 48}", f"m{_MAX_HISTORY_ENTRIES + 49}",
+        ]
+
+    def test_add_fact_dedup_after_facts_replaced_or_cleared(self):
+        s = SessionMemory(session_id="t", goal="g")
+        s.add_fact("a")
+        s.facts = ["b"]
+        s.add_fact("b")
+        s.add_fact("a")
+        assert s.facts == ["b", "a"]
+        s.clear()
+        s.add_fact("a")
+        assert s.facts == ["a"]
+
+    def test_facts_setter_rebuilds_index(self):
+        s = SessionMemory(session_id="t", goal="g")
+        s.add_fact("a")
+        s.facts = ["c", "b", "c"]
+        assert s.facts == ["c", "b"]
+        assert s.add_fact("a") is True
+        assert s.add_fact("b") is False
+        assert s.facts == ["c", "b", "a"]
+
     def test_add_error(self):
         s = SessionMemory(session_id="t", goal="g")
         s.add_error("timeout", step_id=5)
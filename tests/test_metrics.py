@@ -305,6 +305,16 @@ class TestFewShotReadiness:
         fs = next(s for s in result.scores if s.name == "Few-Shot Readiness")
         assert fs.score >= 0.5
 
+    def test_qa_pair_across_lines(self):
+        prompt = (
+            "Classify each message.\n"
+            "Q: disk full\n"
+            "A: critical"
+        )
+        result = evaluate_prompt(prompt)
+        fs = next(s for s in result.scores if s.name == "Few-Shot Readiness")
+        assert fs.score >= 0.7
+
 
 # ---------------------------------------------------------------------------
 # Task decomposition scoring
@@ -546,6 +556,13 @@ class TestEdgeCases:
         structure = next(s for s in result.scores if s.name == "Structure")
         assert structure.score >= 0.5
 
+    def test_repeated_markers_do_not_backtrack(self):
+        # Nested ".*" in the Q/A and first/then/finally patterns used to
+        # make these inputs take minutes.
+        for prompt in ("q: x\n" * 2000, "first then " * 2000):
+            result = evaluate_prompt(prompt)
+            assert 0 <= result.overall_score <= 100
+
     def test_empty_response(self):
         result = evaluate_response("test prompt", "")
         assert result.word_count == 0
@@ -697,24 +714,26 @@ class TestModeAlignmentAllModes:
 # Suggestion coverage
 # ---------------------------------------------------------------------------
 
+def _suggestions_lower(result) -> str:
+    """All suggestions lower-cased once, one per line."""
+    return "\n".join(result.suggestions).lower()
+
+
 class TestSuggestionCoverage:
     def test_delimiter_suggestion_for_long_unstructured(self):
         prompt = "word " * 60
         result = evaluate_prompt(prompt.strip())
-        has_delimiter_sug = any("delimiter" in s.lower() for s in result.suggestions)
-        assert has_delimiter_sug
+        assert "delimiter" in _suggestions_lower(result)
 
     def test_cot_suggestion_for_reasoning_without_cot(self):
         result = evaluate_prompt("Why does this algorithm have O(n log n) complexity?")
-        has_cot_sug = any("step" in s.lower() or "reasoning" in s.lower()
-                          for s in result.suggestions)
-        assert has_cot_sug
+        text = _suggestions_lower(result)
+        assert "step" in text or "reasoning" in text
 
     def test_few_shot_suggestion_for_classification(self):
         result = evaluate_prompt("Classify these errors by severity")
-        has_fs_sug = any("example" in s.lower() or "few-shot" in s.lower()
-                         for s in result.suggestions)
-        assert has_fs_sug
+        text = _suggestions_lower(result)
+        assert "example" in text or "few-shot" in text
 
     def test_decomposition_suggestion_for_complex(self):
         result = evaluate_prompt(
@@ -722,9 +741,8 @@ class TestSuggestionCoverage:
             "review firewall rules and furthermore analyze performance "
             "metrics and write a comprehensive report"
         )
-        has_decomp_sug = any("subtask" in s.lower() or "numbered" in s.lower()
-                             or "break" in s.lower() for s in result.suggestions)
-        assert has_decomp_sug
+        text = _suggestions_lower(result)
+        assert "subtask" in text or "numbered" in text or "break" in text
 
 
 # ---------------------------------------------------------------------------
@@ -8,6 +8,8 @@ from ollama_chain.models import (
     ModelInfo,
     _get,
     _parse_param_size,
+    discover_models,
+    ensure_memory_available,
     list_models_table,
     pick_models,
 )
@@ -157,7 +159,6 @@ class TestDiscoverModels:
                 },
             ]
         }
-        from ollama_chain.models import discover_models
         models = discover_models()
         assert len(models) == 2
         assert models[0].name == "qwen3:8b"  # sorted smallest first
@@ -166,7 +167,6 @@ class TestDiscoverModels:
     @patch("ollama_chain.models.ollama")
     def test_empty_models(self, mock_ollama):
         mock_ollama.list.return_value = {"models": []}
-        from ollama_chain.models import discover_models
         models = discover_models()
         assert models == []
 
@@ -175,11 +175,21 @@ class TestDiscoverModels:
         mock_ollama.list.return_value = {
             "models": [{"model": "test:1b", "size": 1000, "details": {}}]
         }
-        from ollama_chain.models import discover_models
         models = discover_models()
         assert len(models) == 1
         assert models[0].quantization == "unknown"
 
+    @patch("ollama_chain.models.ollama")
+    def test_uses_given_client(self, mock_ollama):
+        client = MagicMock()
+        client.list.return_value = {
+            "models": [{"model": "test:1b", "size": 1000, "details": {}}]
+        }
+        models = discover_models(client)
+        assert [m.name for m in models] == ["test:1b"]
+        client.list.assert_called_once()
+        mock_ollama.list.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # ensure_memory_available (mocked)
@@ -195,7 +205,6 @@ class TestEnsureMemoryAvailable:
                 {"model": "stale:7b", "size": 5_000_000_000},
             ]
         }
-        from ollama_chain.models import ensure_memory_available
         ensure_memory_available(["needed:14b"])
         mock_unload.assert_not_called()
 
@@ -208,7 +217,6 @@ class TestEnsureMemoryAvailable:
                 {"model": "stale:7b", "size": 5_000_000_000},
             ]
         }
-        from ollama_chain.models import ensure_memory_available
         ensure_memory_available(["needed:14b"])
         mock_unload.assert_called_once_with("stale:7b")
 
@@ -221,6 +229,5 @@ class TestEnsureMemoryAvailable:
                 {"model": "needed:14b", "size": 9_000_000_000},
             ]
         }
-        from ollama_chain.models import ensure_memory_available
         ensure_memory_available(["needed:14b"])
         mock_unload.assert_not_called()
@@ -27,14 +27,27 @@ MODELS = ["small:7b", "medium:14b", "large:32b"]
 # ---------------------------------------------------------------------------
 
 class TestClassifyComplexityHeuristic:
-    def test_simple_what_is(self):
-        c, conf = classify_complexity_heuristic("What is SSH?")
+    @pytest.mark.parametrize("query", [
+        "What is SSH?",
+        "What port does HTTPS use?",
+        "Define mutex",
+        "HOW MANY bits in an IPv6 address?",
+    ])
+    def test_simple_prefixes(self, query):
+        c, conf = classify_complexity_heuristic(query)
         assert c == COMPLEXITY_SIMPLE
         assert conf > 0
 
-    def test_simple_short(self):
-        c, _ = classify_complexity_heuristic("What port does HTTPS use?")
-        assert c == COMPLEXITY_SIMPLE
+    def test_conjunction_raises_score(self):
+        # Same word count and terms; only the connective differs.
+        c_plain, _ = classify_complexity_heuristic(
+            "Explain replication in clusters, whatever the failover path",
+        )
+        c_conj, _ = classify_complexity_heuristic(
+            "Explain replication in clusters, moreover the failover path",
+        )
+        assert c_plain == COMPLEXITY_SIMPLE
+        assert c_conj == COMPLEXITY_MODERATE
 
     def test_moderate_medium_length(self):
         c, _ = classify_complexity_heuristic(
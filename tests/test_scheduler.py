@@ -1,6 +1,9 @@
 """Unit tests for scheduler.py — PromptJob, Scheduler lifecycle."""
 
 import asyncio
+import os
+import stat
+import tempfile
 import time
 
 import pytest
@@ -10,6 +13,7 @@ from ollama_chain.scheduler import (
     Scheduler,
     _DEFAULT_JOB_TIMEOUT,
     _get_available_memory_ratio,
+    remove_spill_dir,
 )
 
 
@@ -47,6 +51,67 @@ class TestPromptJob:
         assert job.to_dict()["timeout"] == 120
 
 
+class TestProgressSpill:
+    @pytest.fixture(autouse=True)
+    def small_limits(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("ollama_chain.scheduler._PROGRESS_HIGH_WATER", 10)
+        monkeypatch.setattr("ollama_chain.scheduler._PROGRESS_TAIL", 4)
+        monkeypatch.setattr("ollama_chain.scheduler._SPILL_DIR", str(tmp_path))
+
+    def test_no_spill_below_high_water(self):
+        job = PromptJob(id="s0", prompt="q", mode="fast")
+        for i in range(10):
+            job.add_progress(f"line {i}")
+        assert job.spill_path is None
+        assert job.progress_offset == 0
+        assert job.progress_total == 10
+
+    def test_spills_and_keeps_tail(self):
+        job = PromptJob(id="s1", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        assert len(job.progress) <= 10
+        assert job.progress[-1] == "line 24"
+        assert job.progress_total == 25
+        assert os.path.isfile(job.spill_path)
+
+    def test_progress_from_reads_spilled_history(self):
+        job = PromptJob(id="s2", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        assert job.progress_from(0) == [f"line {i}" for i in range(25)]
+        assert job.progress_from(20) == [f"line {i}" for i in range(20, 25)]
+        assert job.progress_from(25) == []
+
+    def test_spilled_lines_keep_carriage_returns(self):
+        job = PromptJob(id="s4", prompt="q", mode="fast")
+        lines = [f"line {i}\rprogress" if i == 3 else f"line {i}" for i in range(25)]
+        for line in lines:
+            job.add_progress(line)
+        assert job.progress_from(0) == lines
+        assert job.progress_from(20) == lines[20:]
+
+    def test_spill_dir_is_private_and_removable(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("ollama_chain.scheduler._SPILL_DIR", None)
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        job = PromptJob(id="s5", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        spill_dir = os.path.dirname(job.spill_path)
+        assert os.path.dirname(spill_dir) == str(tmp_path)
+        assert os.path.basename(spill_dir) != "ollama-chain-progress"
+        assert stat.S_IMODE(os.stat(spill_dir).st_mode) == 0o700
+        remove_spill_dir()
+        assert not os.path.exists(spill_dir)
+
+    def test_discard_spill(self):
+        job = PromptJob(id="s3", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        job.discard_spill()
+        assert not os.path.exists(job.spill_path)
+
+
 # ---------------------------------------------------------------------------
 # Scheduler — basic operations (synchronous parts)
 # ---------------------------------------------------------------------------
@@ -135,6 +200,28 @@ class TestSchedulerAsync:
         assert job.max_iterations == 5
         assert job.timeout == 120
 
+    @pytest.mark.asyncio
+    async def test_submit_many_preserves_order(self, scheduler):
+        jobs = await scheduler.submit_many([
+            {"prompt": "q1", "mode": "fast"},
+            {"prompt": "q2", "mode": "cascade", "timeout": 60},
+        ])
+        assert [j.prompt for j in jobs] == ["q1", "q2"]
+        assert jobs[1].timeout == 60
+        assert scheduler.queue_position(jobs[0].id) == 0
+        assert scheduler.queue_position(jobs[1].id) == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_position_skips_finished_jobs(self, scheduler):
+        job1 = await scheduler.submit("q1", "fast")
+        job2 = await scheduler.submit("q2", "fast")
+        job3 = await scheduler.submit("q3", "fast")
+        job1.status = "running"
+        scheduler.cancel(job2.id)
+        assert scheduler.queue_position(job3.id) == 0
+        assert scheduler.queue_position(job1.id) == -1
+        assert scheduler.queue_size == 1
+
     @pytest.mark.asyncio
     async def test_queue_size_increments(self, scheduler):
         await scheduler.submit("q1", "fast")
@@ -1,5 +1,7 @@
 """Unit tests for search.py — SearchResult, formatting, providers (mocked)."""
 
+import gzip
+import io
 import json
 from unittest.mock import MagicMock, patch
 
@@ -9,10 +11,29 @@ from ollama_chain.search import (
     SearchResult,
     TRUSTED_DOCS_DOMAINS,
     _SOURCE_LABELS,
+    _drop_ddgs,
+    docs_search,
     format_search_results,
+    github_search,
+    stackoverflow_search,
+    web_search,
+    web_search_news,
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_ddgs_client():
+    """Drop the thread's cached DDGS client so each test's patch takes effect."""
+    _drop_ddgs()
+    yield
+    _drop_ddgs()
+
+
+def _http_response(body: bytes) -> io.BytesIO:
+    """Stand-in for a urlopen() response: a context manager with read()."""
+    return io.BytesIO(body)
+
+
 # ---------------------------------------------------------------------------
 # SearchResult dataclass
 # ---------------------------------------------------------------------------
@@ -26,6 +47,9 @@ class TestSearchResult:
         r = SearchResult(title="t", url="u", snippet="s", source="github")
         assert r.source == "github"
 
+    def test_slotted(self):
+        assert not hasattr(SearchResult(title="t", url="u", snippet="s"), "__dict__")
+
 
 # ---------------------------------------------------------------------------
 # format_search_results
@@ -107,7 +131,6 @@ class TestWebSearch:
         ]
         mock_ddgs_cls.return_value = mock_ddgs
 
-        from ollama_chain.search import web_search
         results = web_search("test")
         assert len(results) == 1
         assert results[0].source == "web"
@@ -117,10 +140,34 @@ class TestWebSearch:
     def test_handles_exception(self, mock_ddgs_cls):
         mock_ddgs_cls.side_effect = Exception("network error")
 
-        from ollama_chain.search import web_search
         results = web_search("test")
         assert results == []
 
+    @patch("ollama_chain.search.DDGS")
+    def test_client_reused_across_calls(self, mock_ddgs_cls):
+        mock_ddgs_cls.return_value.text.return_value = []
+
+        web_search("a")
+        web_search("b")
+        web_search_news("c")
+        assert mock_ddgs_cls.call_count == 1
+
+    @patch("ollama_chain.search.DDGS")
+    def test_client_replaced_after_failure(self, mock_ddgs_cls):
+        mock_ddgs_cls.return_value.text.side_effect = [Exception("reset"), []]
+
+        web_search("a")
+        web_search("b")
+        assert mock_ddgs_cls.call_count == 2
+
+    @patch("ollama_chain.search.DDGS")
+    def test_failure_logged(self, mock_ddgs_cls, caplog):
+        mock_ddgs_cls.side_effect = Exception("network error")
+
+        with caplog.at_level("WARNING", logger="ollama_chain.search"):
+            web_search("test")
+        assert "web search failed — network error" in caplog.text
+
 
 # ---------------------------------------------------------------------------
 # github_search (mocked)
@@ -139,13 +186,8 @@ class TestGithubSearch:
                 "topics": ["ml"],
             }]
         }
-        mock_resp = MagicMock()
-        mock_resp.read.return_value = json.dumps(data).encode()
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
+        mock_urlopen.return_value = _http_response(json.dumps(data).encode())
 
-        from ollama_chain.search import github_search
         results = github_search("test")
         assert len(results) == 1
         assert results[0].source == "github"
@@ -155,7 +197,6 @@ class TestGithubSearch:
     def test_handles_exception(self, mock_urlopen):
         mock_urlopen.side_effect = Exception("timeout")
 
-        from ollama_chain.search import github_search
         assert github_search("test") == []
 
 
@@ -176,18 +217,23 @@ class TestStackoverflowSearch:
                 "tags": ["python", "linux"],
             }]
         }
-        mock_resp = MagicMock()
-        mock_resp.read.return_value = json.dumps(data).encode()
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
+        mock_urlopen.return_value = _http_response(json.dumps(data).encode())
 
-        from ollama_chain.search import stackoverflow_search
         results = stackoverflow_search("test")
         assert len(results) == 1
         assert results[0].source == "stackoverflow"
         assert "42" in results[0].snippet
 
+    @patch("ollama_chain.search.urllib.request.urlopen")
+    def test_gzipped_response(self, mock_urlopen):
+        data = {"items": [{"title": "Q", "link": "https://stackoverflow.com/q/1"}]}
+        mock_urlopen.return_value = _http_response(
+            gzip.compress(json.dumps(data).encode()),
+        )
+
+        results = stackoverflow_search("test")
+        assert [r.title for r in results] == ["Q"]
+
 
 # ---------------------------------------------------------------------------
 # docs_search (mocked)
@@ -202,7 +248,6 @@ class TestDocsSearch:
         ]
         mock_ddgs_cls.return_value = mock_ddgs
 
-        from ollama_chain.search import docs_search
         results = docs_search("kubernetes pods")
         assert len(results) == 1
         assert results[0].source == "docs"
@@ -2,13 +2,19 @@
 
 import asyncio
 import json
+import logging
 import os
 import tempfile
+import threading
 
 import pytest
 
 from ollama_chain.server import (
+    _LOG_DATE_FORMAT,
     _TERMINAL_STATUSES,
+    _CachedTimeFormatter,
+    _write_chunked,
+    _write_progress,
     create_app,
     setup_logging,
 )
@@ -29,6 +35,47 @@ class TestSetupLogging:
             assert os.path.isfile(log_file)
 
 
+class TestCachedTimeFormatter:
+    @staticmethod
+    def _record(created: float) -> logging.LogRecord:
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+        record.created = created
+        return record
+
+    def test_matches_stock_formatter(self):
+        record = self._record(1_700_000_000.25)
+        cached = _CachedTimeFormatter(datefmt=_LOG_DATE_FORMAT)
+        stock = logging.Formatter(datefmt=_LOG_DATE_FORMAT)
+        assert cached.formatTime(record, _LOG_DATE_FORMAT) == \
+            stock.formatTime(record, _LOG_DATE_FORMAT)
+
+    def test_recomputes_on_new_second(self):
+        fmt = _CachedTimeFormatter(datefmt=_LOG_DATE_FORMAT)
+        first = fmt.formatTime(self._record(1_700_000_000.1), _LOG_DATE_FORMAT)
+        same = fmt.formatTime(self._record(1_700_000_000.9), _LOG_DATE_FORMAT)
+        later = fmt.formatTime(self._record(1_700_000_001.0), _LOG_DATE_FORMAT)
+        assert first == same
+        assert later != first
+
+    def test_cache_is_per_thread(self):
+        fmt = _CachedTimeFormatter(datefmt=_LOG_DATE_FORMAT)
+        stock = logging.Formatter(datefmt=_LOG_DATE_FORMAT)
+        main_record = self._record(1_700_000_000.0)
+        fmt.formatTime(main_record, _LOG_DATE_FORMAT)
+        seen = []
+        other = self._record(1_700_086_400.0)  # a day later
+        t = threading.Thread(
+            target=lambda: seen.append(fmt.formatTime(other, _LOG_DATE_FORMAT)),
+        )
+        t.start()
+        t.join()
+        assert seen == [stock.formatTime(other, _LOG_DATE_FORMAT)]
+        # The other thread's entry did not replace this thread's.
+        assert fmt._local.cached == (
+            1_700_000_000, stock.formatTime(main_record, _LOG_DATE_FORMAT),
+        )
+
+
 # ---------------------------------------------------------------------------
 # Terminal statuses
 # ---------------------------------------------------------------------------
@@ -45,6 +92,68 @@ class TestTerminalStatuses:
         assert "running" not in _TERMINAL_STATUSES
 
 
+# ---------------------------------------------------------------------------
+# _write_chunked
+# ---------------------------------------------------------------------------
+
+class _FakeResponse:
+    def __init__(self):
+        self.writes: list[bytes] = []
+
+    async def write(self, data) -> None:
+        self.writes.append(bytes(data))
+
+
+class TestWriteChunked:
+    @pytest.mark.asyncio
+    async def test_small_payload_single_write(self):
+        resp = _FakeResponse()
+        await _write_chunked(resp, b"x" * 100)
+        assert resp.writes == [b"x" * 100]
+
+    @pytest.mark.asyncio
+    async def test_large_payload_split(self):
+        resp = _FakeResponse()
+        data = bytes(range(256)) * 1024  # 256 KiB
+        await _write_chunked(resp, data)
+        assert len(resp.writes) == 16
+        assert b"".join(resp.writes) == data
+
+
+class TestWriteProgress:
+    @pytest.fixture(autouse=True)
+    def small_limits(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("ollama_chain.scheduler._PROGRESS_HIGH_WATER", 10)
+        monkeypatch.setattr("ollama_chain.scheduler._PROGRESS_TAIL", 4)
+        monkeypatch.setattr("ollama_chain.scheduler._SPILL_DIR", str(tmp_path))
+
+    @staticmethod
+    def _ids(resp: "_FakeResponse") -> list[int]:
+        return [int(w.split(b"\n", 1)[0][4:]) for w in resp.writes]
+
+    @pytest.mark.asyncio
+    async def test_resume_from_spilled_history(self):
+        job = PromptJob(id="w1", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        resp = _FakeResponse()
+        idx = 5
+        while idx < job.progress_total:
+            idx = await _write_progress(resp, job, idx)
+        assert idx == 25
+        assert self._ids(resp) == list(range(5, 25))
+
+    @pytest.mark.asyncio
+    async def test_unreadable_spill_is_skipped(self):
+        job = PromptJob(id="w2", prompt="q", mode="fast")
+        for i in range(25):
+            job.add_progress(f"line {i}")
+        job.discard_spill()
+        resp = _FakeResponse()
+        assert await _write_progress(resp, job, 0) == job.progress_offset
+        assert resp.writes == []
+
+
 # ---------------------------------------------------------------------------
 # API endpoints (using aiohttp_client fixture from pytest-aiohttp)
 # ---------------------------------------------------------------------------
@@ -103,6 +212,15 @@ async def test_submit_invalid_json(aiohttp_client, app):
     assert resp.status == 400
 
 
+@pytest.mark.asyncio
+async def test_submit_repeated_errors(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    for _ in range(2):
+        resp = await client.post("/api/prompt", json={"prompt": ""})
+        assert resp.status == 400
+        assert "prompt" in await resp.text()
+
+
 @pytest.mark.asyncio
 async def test_submit_cli_only_pcap_rejected(aiohttp_client, app):
     client = await aiohttp_client(app)
@@ -130,6 +248,63 @@ async def test_submit_default_mode(aiohttp_client, app):
     assert resp.status == 202
 
 
+@pytest.mark.asyncio
+async def test_submit_batch(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    resp = await client.post(
+        "/api/prompt/batch",
+        json={"prompts": [{"prompt": "a"}, {"prompt": "b", "mode": "fast"}]},
+    )
+    assert resp.status == 202
+    jobs = (await resp.json())["jobs"]
+    assert len(jobs) == 2
+    assert all("job_id" in j and "position" in j for j in jobs)
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_empty(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    resp = await client.post("/api/prompt/batch", json={"prompts": []})
+    assert resp.status == 400
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_too_large(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    resp = await client.post(
+        "/api/prompt/batch", json={"prompts": [{"prompt": "q"}] * 65},
+    )
+    assert resp.status == 400
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_invalid_item_queues_nothing(aiohttp_client, app):
+    from ollama_chain.server import scheduler as sched
+    client = await aiohttp_client(app)
+    before = len(sched._jobs)
+    resp = await client.post(
+        "/api/prompt/batch",
+        json={"prompts": [{"prompt": "ok"}, {"prompt": "x", "mode": "pcap"}]},
+    )
+    assert resp.status == 400
+    assert "prompts[1]" in await resp.text()
+    assert len(sched._jobs) == before
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_logs_no_new_prompts(aiohttp_client, app, caplog):
+    client = await aiohttp_client(app)
+    with caplog.at_level(logging.INFO, logger="ollama_chain.server"):
+        await client.post(
+            "/api/prompt/batch",
+            json={"prompts": [{"prompt": "ok"}, {"prompt": "x", "mode": "pcap"}]},
+        )
+        await client.post("/api/prompt/batch", json={"prompts": [{"prompt": "a"}]})
+    new = [r for r in caplog.records if r.getMessage().startswith("New prompt")]
+    assert len(new) == 1
+    assert new[0].getMessage().endswith("prompt=a")
+
+
 @pytest.mark.asyncio
 async def test_get_existing_job(aiohttp_client, app):
     client = await aiohttp_client(app)
@@ -1,27 +1,56 @@
 """Unit tests for the tools module — no Ollama required."""
 
+import logging
 import os
 import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 import pytest
 
 from ollama_chain.tools import (
     TOOL_FALLBACKS,
     TOOL_REGISTRY,
+    Tool,
     ToolResult,
     execute_tool,
+    execute_tool_batch,
     execute_tool_with_retry,
     format_tool_descriptions,
+    tool_stats,
     _adapt_args_for_fallback,
+    _RateLimitFilter,
+    _adaptive_timeout,
+    _backoff_delay,
+    _circuit_open,
+    _direct_argv,
+    _expand,
+    _fallback_calls,
+    _invalidate_tool_descriptions,
+    _record_latency,
+    _record_outcome,
+    _reserve_probe,
+    _run_search_with_timeout,
+    _run_with_retries,
+    _ToolMetrics,
+    clear_search_cache,
+    tool_web_search_tool,
 )
 
 
+@pytest.fixture(autouse=True)
+def clean_result_cache(monkeypatch):
+    monkeypatch.setattr("ollama_chain.tools._RESULT_CACHE", OrderedDict())
+
+
 class TestToolResult:
     def test_defaults(self):
         r = ToolResult(success=True, output="ok", tool_name="test")
         assert r.duration_ms == 0.0
         assert r.retries_used == 0
         assert r.error_detail == ""
+        assert r.backoff_ms_total == 0.0
 
     def test_with_metadata(self):
         r = ToolResult(
@@ -32,6 +61,11 @@ class TestToolResult:
         assert r.retries_used == 2
         assert r.error_detail == "timeout"
 
+    def test_slotted(self):
+        r = ToolResult(success=True, output="ok", tool_name="test")
+        assert not hasattr(r, "__dict__")
+        assert not hasattr(TOOL_REGISTRY["shell"], "__dict__")
+
 
 class TestExecuteTool:
     def test_shell_echo(self):
@@ -43,6 +77,55 @@ class TestExecuteTool:
         r = execute_tool("shell", {"command": "false"})
         assert not r.success
 
+    def test_shell_stderr_and_exit_code(self):
+        r = execute_tool("shell", {"command": "echo out; echo err >&2; exit 3"})
+        assert not r.success
+        assert "out" in r.output
+        assert "[stderr] err" in r.output
+        assert "[exit code: 3]" in r.output
+
+    def test_shell_sections_joined_by_newline(self):
+        r = execute_tool("shell", {"command": "echo '  out  '; echo err >&2"})
+        assert r.output == "out\n[stderr] err"
+
+    def test_shell_no_output(self):
+        r = execute_tool("shell", {"command": "printf '  '"})
+        assert r.output == "(no output)"
+
+    def test_shell_direct_argv(self):
+        assert _direct_argv("uname -r") == ["uname", "-r"]
+        assert _direct_argv("echo 'a b'") == ["echo", "a b"]
+        for cmd in ("ls *.py", "a | b", "echo $HOME", "cd /tmp", "X=1 env", "ls ~"):
+            assert _direct_argv(cmd) is None
+
+    def test_shell_missing_command_reported_by_shell(self):
+        r = execute_tool("shell", {"command": "no-such-command-xyz"})
+        assert not r.success
+        assert r.error_detail == "exit 127"
+
+    def test_shell_timeout(self):
+        r = execute_tool("shell", {"command": "sleep 5", "timeout": 0.2})
+        assert not r.success
+        assert r.error_detail == "timeout"
+
+    def test_shell_output_capped(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._MAX_SHELL_OUTPUT", 1000)
+        r = execute_tool("shell", {"command": "yes"})
+        assert not r.success
+        assert r.error_detail == "truncated"
+        assert "output truncated" in r.output
+        assert len(r.output) < 2000
+
+    def test_truncated_shell_runs_once(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("ollama_chain.tools._MAX_SHELL_OUTPUT", 1000)
+        marker = tmp_path / "runs"
+        r = execute_tool_with_retry(
+            "shell", {"command": f"echo x >> {marker}; yes"},
+        )
+        assert r.error_detail == "truncated"
+        assert r.retries_used == 0
+        assert marker.read_text() == "x\n"
+
     def test_python_eval(self):
         r = execute_tool("python_eval", {"code": "2 ** 10"})
         assert r.success
@@ -53,6 +136,43 @@ class TestExecuteTool:
         assert not r.success
         assert "Error" in r.output
 
+    def test_python_eval_math(self):
+        r = execute_tool("python_eval", {"code": "math.sqrt(16)"})
+        assert r.success
+        assert r.output == "4.0"
+
+    def test_python_eval_namespace_not_shared(self):
+        assert execute_tool("python_eval", {"code": "(leak := 5)"}).success
+        r = execute_tool("python_eval", {"code": "leak"})
+        assert not r.success
+
+    def test_python_eval_blocks_dunder_escape(self):
+        r = execute_tool("python_eval", {"code": "().__class__.__base__.__subclasses__()"})
+        assert not r.success
+        assert r.error_detail == "forbidden"
+
+    def test_python_eval_blocks_nfkc_dunder_escape(self):
+        # U+FE33 folds to "_" under the NFKC normalisation applied to names.
+        code = "()._\ufe33class_\ufe33._\ufe33base_\ufe33._\ufe33subclasses_\ufe33()"
+        r = execute_tool("python_eval", {"code": code})
+        assert not r.success
+        assert r.error_detail == "forbidden"
+
+    def test_python_eval_blocks_forbidden_names(self):
+        r = execute_tool("python_eval", {"code": "getattr(1, 'real')"})
+        assert not r.success
+        assert r.error_detail == "forbidden"
+
+    def test_python_eval_forbidden_word_in_string_allowed(self):
+        r = execute_tool("python_eval", {"code": "'eval' + 'uate'"})
+        assert r.success
+        assert r.output == "evaluate"
+
+    def test_python_eval_syntax_error(self):
+        r = execute_tool("python_eval", {"code": "1 +"})
+        assert not r.success
+        assert r.error_detail == "SyntaxError"
+
     def test_read_file(self, tmp_path):
         f = tmp_path / "test.txt"
         f.write_text("content123")
@@ -65,6 +185,36 @@ class TestExecuteTool:
         assert not r.success
         assert r.error_detail
 
+    def test_read_file_truncated(self, tmp_path):
+        f = tmp_path / "big.txt"
+        f.write_text("x" * 60_000)
+        r = execute_tool("read_file", {"path": str(f)})
+        assert r.success
+        assert r.output.startswith("x" * 50_000)
+        assert r.output.endswith("[truncated, file too large]")
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs procfs")
+    def test_read_file_without_stat_size(self):
+        r = execute_tool("read_file", {"path": "/proc/self/status"})
+        assert r.success
+        assert "Name:" in r.output
+
+    @pytest.mark.skipif(
+        not os.path.exists("/sys/devices/system/cpu/online"), reason="needs sysfs",
+    )
+    def test_read_file_sysfs_attribute(self):
+        # Regular file with a nominal 4096-byte size that cannot be mmapped.
+        r = execute_tool("read_file", {"path": "/sys/devices/system/cpu/online"})
+        assert r.success
+        assert r.output.strip()[0].isdigit()
+
+    def test_read_file_empty(self, tmp_path):
+        f = tmp_path / "empty.txt"
+        f.touch()
+        r = execute_tool("read_file", {"path": str(f)})
+        assert r.success
+        assert r.output == "(empty file)"
+
     def test_write_file(self, tmp_path):
         p = str(tmp_path / "out.txt")
         r = execute_tool("write_file", {"path": p, "content": "data"})
@@ -72,6 +222,12 @@ class TestExecuteTool:
         assert os.path.exists(p)
         assert open(p).read() == "data"
 
+    def test_write_file_creates_parents(self, tmp_path):
+        p = tmp_path / "a" / "b" / "out.txt"
+        r = execute_tool("write_file", {"path": str(p), "content": "x"})
+        assert r.success
+        assert p.read_text() == "x"
+
     def test_append_file(self, tmp_path):
         p = str(tmp_path / "app.txt")
         open(p, "w").write("A")
@@ -87,6 +243,39 @@ class TestExecuteTool:
         assert "a.txt" in r.output
         assert "b.txt" in r.output
 
+    def test_list_dir_empty(self, tmp_path):
+        r = execute_tool("list_dir", {"path": str(tmp_path)})
+        assert r.success
+        assert r.output == "(empty directory)"
+
+    def test_list_dir_marks_directories(self, tmp_path):
+        (tmp_path / "pkg.d").mkdir()
+        (tmp_path / "f.txt").touch()
+        r = execute_tool("list_dir", {"path": str(tmp_path)})
+        assert r.output.splitlines() == ["f.txt", "pkg.d/"]
+
+    def test_list_dir_sorted_and_capped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._MAX_LISTDIR", 2)
+        for name in ("c", "a", "b"):
+            (tmp_path / name).touch()
+        r = execute_tool("list_dir", {"path": str(tmp_path)})
+        assert r.output.splitlines() == ["a", "b", "... 1 more"]
+
+    def test_list_dir_unsorted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._MAX_LISTDIR", 2)
+        for name in ("c", "a", "b"):
+            (tmp_path / name).touch()
+        r = execute_tool("list_dir", {"path": str(tmp_path), "sort": "false"})
+        lines = r.output.splitlines()
+        assert len(lines) == 3
+        assert lines[-1] == "... 1 more"
+
+    def test_expand_home(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._HOME", "/home/x")
+        assert _expand("~") == "/home/x"
+        assert _expand("~/a/b") == "/home/x/a/b"
+        assert _expand("/tmp/~a") == "/tmp/~a"
+
     def test_unknown_tool(self):
         r = execute_tool("nonexistent", {})
         assert not r.success
@@ -110,12 +299,372 @@ class TestExecuteToolWithRetry:
         assert r.success
         assert "retry_test" in r.output
 
+    def test_backoff_recorded(self, monkeypatch):
+        monkeypatch.setattr(TOOL_REGISTRY["shell"], "retry_delay", 0.01)
+        r = execute_tool_with_retry("shell", {"command": "false"})
+        assert not r.success
+        assert r.retries_used == 1
+        assert 5 <= r.backoff_ms_total <= 15
+
+    def test_single_attempt_tool(self, monkeypatch):
+        calls = []
+
+        def boom():
+            calls.append(1)
+            raise ValueError("nope")
+
+        monkeypatch.setitem(TOOL_REGISTRY, "boom", Tool("boom", "", {}, boom))
+        r = execute_tool_with_retry("boom", {})
+        assert not r.success
+        assert r.error_detail == "ValueError"
+        assert r.retries_used == 1
+        assert r.backoff_ms_total == 0
+        assert calls == [1]
+
+
+class TestResultCache:
+    def test_read_served_from_cache(self, tmp_path):
+        f = tmp_path / "a.txt"
+        f.write_text("one")
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).output == "one"
+        f.write_text("two")
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).output == "one"
+
+    def test_side_effecting_tool_clears_cache(self, tmp_path):
+        f = tmp_path / "a.txt"
+        f.write_text("one")
+        execute_tool_with_retry("read_file", {"path": str(f)})
+        execute_tool_with_retry("write_file", {"path": str(f), "content": "two"})
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).output == "two"
+
+    def test_shell_call_clears_cache(self, tmp_path):
+        f = tmp_path / "a.txt"
+        f.write_text("one")
+        execute_tool_with_retry("read_file", {"path": str(f)})
+        execute_tool_with_retry("shell", {"command": f"echo two > {f}"})
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).output == "two\n"
+
+    def test_search_tools_rely_on_provider_cache(self):
+        assert TOOL_REGISTRY["web_search"].cache_ttl == 0
+        assert TOOL_REGISTRY["web_search_news"].cache_ttl == 0
+
+    def test_failures_not_cached(self, tmp_path):
+        f = tmp_path / "late.txt"
+        assert not execute_tool_with_retry("read_file", {"path": str(f)}).success
+        f.write_text("here")
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).success
+
+    def test_expired_entry_refetched(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TOOL_REGISTRY["read_file"], "cache_ttl", 1e-9)
+        f = tmp_path / "a.txt"
+        f.write_text("one")
+        execute_tool_with_retry("read_file", {"path": str(f)})
+        f.write_text("two")
+        assert execute_tool_with_retry("read_file", {"path": str(f)}).output == "two"
+
+
+class TestToolStats:
+    @pytest.fixture(autouse=True)
+    def fresh_metrics(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._METRICS", _ToolMetrics(size=4))
+
+    def test_summarises_per_tool(self):
+        for code in ("1", "2", "1/0"):
+            execute_tool_with_retry("python_eval", {"code": code})
+        stats = tool_stats()["python_eval"]
+        assert stats["calls"] == 3
+        assert stats["failures"] == 1
+        assert 0 <= stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+
+    def test_ring_buffer_keeps_latest(self):
+        for i in range(6):
+            execute_tool_with_retry("python_eval", {"code": str(i)})
+        assert tool_stats()["python_eval"]["calls"] == 4
+
+    def test_cache_hits_not_recorded(self):
+        execute_tool_with_retry("python_eval", {"code": "7"})
+        execute_tool_with_retry("python_eval", {"code": "7"})
+        assert tool_stats()["python_eval"]["calls"] == 1
+
+
+class TestBackoffDelay:
+    def test_grows_exponentially_with_jitter(self):
+        tool = Tool("t", "", {}, lambda: None, retry_delay=1.0)
+        for attempt, base in ((1, 1.0), (2, 2.0), (3, 4.0)):
+            delay = _backoff_delay(tool, attempt)
+            assert 0.5 * base <= delay <= 1.5 * base
+
+    def test_capped(self):
+        tool = Tool("t", "", {}, lambda: None, retry_delay=10.0, max_retry_delay=15.0)
+        assert _backoff_delay(tool, 5) <= 15.0 * 1.5
+
+
+class TestRateLimitFilter:
+    def _record(self):
+        return logging.LogRecord("t", logging.WARNING, "", 0, "msg", None, None)
+
+    def test_drops_records_over_limit(self):
+        flt = _RateLimitFilter(limit=3)
+        passed = [flt.filter(self._record()) for _ in range(5)]
+        assert passed == [True, True, True, False, False]
+
+    def test_window_slides(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("ollama_chain.tools.time.monotonic", lambda: now[0])
+        flt = _RateLimitFilter(limit=2)
+        assert flt.filter(self._record())
+        assert flt.filter(self._record())
+        assert not flt.filter(self._record())
+        now[0] += 1.5
+        assert flt.filter(self._record())
+
+
+class TestSearchTimeout:
+    @pytest.fixture(autouse=True)
+    def clean_latency(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._LATENCY", {})
+
+    def test_returns_results(self):
+        assert _run_search_with_timeout(lambda q, max_results: [q] * max_results,
+                                        "x", max_results=2) == ["x", "x"]
+
+    def test_times_out(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._WEB_TOOL_TIMEOUT", 0.05)
+        assert _run_search_with_timeout(time.sleep, 0.5) is None
+
+    def test_tool_reports_timeout(self, monkeypatch):
+        monkeypatch.setattr("ollama_chain.tools._WEB_TOOL_TIMEOUT", 0.05)
+        monkeypatch.setattr(
+            "ollama_chain.tools.web_search",
+            lambda query, max_results: time.sleep(0.5),
+        )
+        r = tool_web_search_tool("anything")
+        assert not r.success
+        assert r.error_detail == "timeout"
+
+    def test_saturated_pool_rejects(self, monkeypatch):
+        monkeypatch.setattr(
+            "ollama_chain.tools._SEARCH_SLOTS", threading.BoundedSemaphore(1),
+        )
+        monkeypatch.setattr("ollama_chain.tools._WEB_TOOL_TIMEOUT", 0.05)
+        assert _run_search_with_timeout(time.sleep, 0.3) is None
+        # The timed-out call still occupies the only slot.
+        r = execute_tool("web_search", {"query": "x"})
+        assert not r.success
+        assert r.error_detail == "pool_saturated"
+        time.sleep(0.4)
+        assert _run_search_with_timeout(lambda: ["ok"]) == ["ok"]
+
+    def test_results_cached_per_query(self):
+        calls = []
+
+        def provider(query, max_results):
+            calls.append(query)
+            return [query]
+
+        assert _run_search_with_timeout(provider, "Foo  bar", max_results=1) == ["Foo  bar"]
+        assert _run_search_with_timeout(provider, "foo bar", max_results=1) == ["Foo  bar"]
+        assert _run_search_with_timeout(provider, "other", max_results=1) == ["other"]
+        assert calls == ["Foo  bar", "other"]
+        clear_search_cache()
+        _run_search_with_timeout(provider, "foo bar", max_results=1)
+        assert len(calls) == 3
+
+    def test_cache_expires_and_skips_empty(self, monkeypatch):
+        calls = []
+
+        def provider(query):
+            calls.append(query)
+            return [] if query == "none" else [query]
+
+        _run_search_with_timeout(provider, "none")
+        _run_search_with_timeout(provider, "none")
+        assert len(calls) == 2
+        monkeypatch.setattr("ollama_chain.tools._SEARCH_CACHE_TTL", 0.0)
+        _run_search_with_timeout(provider, "q")
+        _run_search_with_timeout(provider, "q")
+        assert len(calls) == 4
+
+    def test_default_timeout_until_enough_samples(self):
+        _record_latency("prov", 0.1)
+        assert _adaptive_timeout("prov") == 20
+
+    def test_fast_provider_gets_short_timeout(self):
+        for _ in range(10):
+            _record_latency("prov", 0.3)
+        assert _adaptive_timeout("prov") == 2.0
+
+    def test_slow_provider_keeps_long_timeout(self):
+        for dt in (8.0, 12.0) * 5:
+            _record_latency("prov", dt)
+        assert 10.0 < _adaptive_timeout("prov") <= 20
+
+
+@pytest.fixture
+def clean_circuit(monkeypatch):
+    monkeypatch.setattr("ollama_chain.tools._CIRCUIT", {})
+    monkeypatch.setattr("ollama_chain.tools._CIRCUIT_PROBES", {})
+
+
+class TestExecuteToolBatch:
+    def test_results_in_input_order(self, tmp_path):
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.txt").write_text(name * 3)
+        calls = [("read_file", {"path": str(tmp_path / f"{n}.txt")}) for n in "abc"]
+        results = execute_tool_batch(calls)
+        assert [r.output for r in results] == ["aaa", "bbb", "ccc"]
+
+    def test_write_is_a_barrier(self, tmp_path):
+        p = str(tmp_path / "f.txt")
+        results = execute_tool_batch([
+            ("write_file", {"path": p, "content": "one"}),
+            ("read_file", {"path": p}),
+            ("append_file", {"path": p, "content": "two"}),
+            ("read_file", {"path": p}),
+        ])
+        assert results[1].output == "one"
+        assert results[3].output == "onetwo"
+
+    def test_empty(self):
+        assert execute_tool_batch([]) == []
+
+    def test_parallel_searches_overlap(self, monkeypatch, clean_circuit):
+        def slow(query):
+            time.sleep(0.2)
+            return ToolResult(True, query, "web_search")
+
+        monkeypatch.setattr(TOOL_REGISTRY["web_search"], "function", slow)
+        t0 = time.monotonic()
+        results = execute_tool_batch(
+            [("web_search", {"query": q}) for q in ("a", "b", "c", "d")],
+        )
+        assert [r.output for r in results] == ["a", "b", "c", "d"]
+        assert time.monotonic() - t0 < 0.6
+
+    def test_python_eval_batched(self):
+        results = execute_tool_batch(
+            [("python_eval", {"code": f"{n} * 2"}) for n in range(5)],
+            parallelism=2,
+        )
+        assert [r.output for r in results] == ["0", "2", "4", "6", "8"]
+
+
+class TestHedgedSearch:
+    @pytest.fixture(autouse=True)
+    def fast_hedge(self, monkeypatch, clean_circuit):
+        monkeypatch.setattr("ollama_chain.tools._HEDGE_DELAY", 0.05)
+
+    def test_slow_primary_hedged_by_fallback(self, monkeypatch):
+        def slow(query):
+            time.sleep(0.5)
+            return ToolResult(True, "slow", "web_search")
+
+        def fast(query):
+            return ToolResult(True, f"fast:{query}", "web_search_news")
+
+        monkeypatch.setattr(TOOL_REGISTRY["web_search"], "function", slow)
+        monkeypatch.setattr(TOOL_REGISTRY["web_search_news"], "function", fast)
+        r = execute_tool_with_retry("web_search", {"query": "q"})
+        assert r.success
+        assert r.output == "fast:q"
+        assert r.tool_name == "web_search>web_search_news"
+
+    def test_primary_failure_returned_when_all_fail(self, monkeypatch):
+        def fail(query):
+            return ToolResult(False, "nothing", "x", error_detail="empty_results")
+
+        monkeypatch.setattr(TOOL_REGISTRY["web_search"], "function", fail)
+        monkeypatch.setattr(TOOL_REGISTRY["web_search"], "max_retries", 1)
+        monkeypatch.setattr(TOOL_REGISTRY["web_search_news"], "function", fail)
+        monkeypatch.setattr(TOOL_REGISTRY["docs_search"], "function", fail)
+        r = execute_tool_with_retry("web_search", {"query": "q"})
+        assert not r.success
+        assert r.error_detail == "empty_results"
+
+    def test_bad_args_not_hedged(self):
+        r = execute_tool_with_retry("web_search", {"bogus": "q"})
+        assert not r.success
+        assert r.error_detail == "bad_args"
+
+
+@pytest.mark.usefixtures("clean_circuit")
+class TestCircuitBreaker:
+    def test_closed_without_history(self):
+        assert not _circuit_open("web_search")
+
+    def test_opens_after_repeated_failures(self):
+        for _ in range(3):
+            _record_outcome("web_search", False)
+        assert not _circuit_open("web_search")  # half-open probe due
+        assert not _circuit_open("web_search")  # checking does not spend it
+        assert _reserve_probe("web_search")
+        assert _circuit_open("web_search")
+        assert not _reserve_probe("web_search")
+
+    def test_listing_fallbacks_keeps_their_probes(self):
+        for _ in range(3):
+            _record_outcome("web_search", False)
+        calls = _fallback_calls("github_search", {"query": "q"})
+        assert [c[0] for c in calls] == ["web_search"]
+        assert _reserve_probe("web_search")
+
+    def test_stays_closed_when_mostly_successful(self):
+        for ok in (True, True, False):
+            _record_outcome("web_search", ok)
+        assert not _circuit_open("web_search")
+
+    def test_ignores_non_search_tools(self):
+        for _ in range(5):
+            _record_outcome("shell", False)
+        assert not _circuit_open("shell")
+
+    def test_truncated_results_not_counted(self, monkeypatch):
+        monkeypatch.setattr(
+            TOOL_REGISTRY["web_search"], "function",
+            lambda query: ToolResult(
+                False, "big", "web_search", error_detail="truncated",
+            ),
+        )
+        for _ in range(3):
+            _run_with_retries(
+                TOOL_REGISTRY["web_search"], "web_search", {"query": "q"}, 0.0,
+            )
+        assert _reserve_probe("web_search")
+        assert _reserve_probe("web_search")  # still closed: no probe needed
+
+    def test_open_circuit_skips_to_fallback(self, monkeypatch):
+        calls = []
+
+        def primary(query):
+            calls.append(query)
+            return ToolResult(True, "primary", "github_search")
+
+        monkeypatch.setattr(TOOL_REGISTRY["github_search"], "function", primary)
+        monkeypatch.setattr(
+            TOOL_REGISTRY["web_search"], "function",
+            lambda query: ToolResult(True, "fallback", "web_search"),
+        )
+        for _ in range(3):
+            _record_outcome("github_search", False)
+        _reserve_probe("github_search")  # consume the probe
+        r = execute_tool_with_retry("github_search", {"query": "q"})
+        assert r.success
+        assert r.tool_name == "github_search>web_search"
+        assert calls == []
+
 
 class TestFallbacks:
     def test_fallback_mapping_exists(self):
         assert "web_search" in TOOL_FALLBACKS
         assert "read_file" in TOOL_FALLBACKS
 
+    def test_fallback_targets_are_registered(self):
+        registered = TOOL_REGISTRY.keys()
+        assert registered >= TOOL_FALLBACKS.keys()
+        for name, fallbacks in TOOL_FALLBACKS.items():
+            assert registered >= set(fallbacks), name
+            assert name not in fallbacks
+
     def test_adapt_search_args(self):
         result = _adapt_args_for_fallback(
             "web_search", "web_search_news", {"query": "test"},
@@ -143,3 +692,19 @@ class TestFormatDescriptions:
     def test_has_parameters(self):
         desc = format_tool_descriptions()
         assert "Parameters:" in desc
+
+    def test_cached(self):
+        assert format_tool_descriptions() is format_tool_descriptions()
+
+    def test_invalidate_picks_up_registry_changes(self, monkeypatch):
+        format_tool_descriptions()
+        monkeypatch.setitem(
+            TOOL_REGISTRY, "extra_tool",
+            Tool("extra_tool", "Extra.", {}, lambda: None),
+        )
+        _invalidate_tool_descriptions()
+        try:
+            assert "extra_tool" in format_tool_descriptions()
+        finally:
+            monkeypatch.undo()
+            _invalidate_tool_descriptions()
@@ -78,6 +78,11 @@ class TestValidatePlan:
         warnings = validate_plan(plan)
         assert any("non-existent" in w for w in warnings)
 
+    def test_non_list_depends_on_reported_once(self):
+        plan = [{"id": 1, "description": "A", "tool": "shell", "depends_on": 5}]
+        warnings = validate_plan(plan)
+        assert warnings == ["Step 1 depends_on is not a list"]
+
     def test_empty_plan(self):
         assert validate_plan([]) == []
 
@@ -124,6 +129,12 @@ class TestValidateAndFixPlan:
         assert fixed[0]["depends_on"] == []
         assert any("invalid" in w.lower() for w in warnings)
 
+    def test_adds_missing_depends_on(self):
+        plan = [{"id": 1, "description": "A", "tool": "shell"}]
+        fixed, warnings = validate_and_fix_plan(plan)
+        assert fixed[0]["depends_on"] == []
+        assert warnings == []
+
     def test_adds_default_status(self):
         plan = [
             {"id": 1, "description": "A", "tool": "shell", "depends_on": []},
@@ -183,6 +194,32 @@ class TestDetectCircularDeps:
     def test_empty_plan(self):
         assert detect_circular_deps([]) == []
 
+    def test_reports_every_cycle(self):
+        plan = [
+            {"id": 1, "depends_on": [2]},
+            {"id": 2, "depends_on": [1]},
+            {"id": 3, "depends_on": [4]},
+            {"id": 4, "depends_on": [3]},
+        ]
+        assert detect_circular_deps(plan) == [(2, 1), (4, 3)]
+
+    def test_long_chain_no_recursion_error(self):
+        plan = [{"id": 1, "depends_on": [5000]}] + [
+            {"id": i, "depends_on": [i - 1]} for i in range(2, 5001)
+        ]
+        assert len(detect_circular_deps(plan)) == 1
+
+    def test_dropping_reported_edges_breaks_all_cycles(self):
+        plan = [
+            {"id": 1, "depends_on": [2, 3]},
+            {"id": 2, "depends_on": [3]},
+            {"id": 3, "depends_on": [1, 2]},
+        ]
+        for a, b in detect_circular_deps(plan):
+            step = next(s for s in plan if s["id"] == a)
+            step["depends_on"].remove(b)
+        assert detect_circular_deps(plan) == []
+
 
 class TestValidateModelSequence:
     def test_valid_sequence(self):